@@ -0,0 +1,28 @@
+import os
+
+from setuptools import build_meta
+from setuptools.build_meta import *  # noqa: F403
+
+# In-tree build backend: setuptools, plus mypy as a build requirement only
+# when CAPITAL_GAINS_MYPYC=1 asks setup.py to compile the hot modules, so
+# pure-Python builds and editable installs do not download it.
+
+MYPYC_REQUIRES = ["mypy>=2.4"]
+
+
+def mypyc_requires() -> list[str]:
+    return MYPYC_REQUIRES if os.environ.get("CAPITAL_GAINS_MYPYC") == "1" else []
+
+
+def get_requires_for_build_wheel(
+    config_settings: dict[str, str | list[str]] | None = None,
+) -> list[str]:
+    return build_meta.get_requires_for_build_wheel(config_settings) + mypyc_requires()
+
+
+def get_requires_for_build_editable(
+    config_settings: dict[str, str | list[str]] | None = None,
+) -> list[str]:
+    return (
+        build_meta.get_requires_for_build_editable(config_settings) + mypyc_requires()
+    )
@@ -0,0 +1,47 @@
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from capital_gains.binary import convert_jsonl, process_archive
+from capital_gains.cli import process_operations
+from capital_gains.tax import Engine
+
+from .workload import WorkloadSpec, generate_lines
+
+# Replays the same workload from JSON lines and from a binary archive.
+
+
+def main() -> None:
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    generated = list(
+        generate_lines(WorkloadSpec(lines=lines, operations_per_line=operations))
+    )
+    total = lines * operations
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "operations.bin"
+        with path.open("wb") as output:
+            convert_jsonl(generated, output)
+        json_size = sum(len(line.encode()) for line in generated)
+        print(f"size: json {json_size:,} bytes | binary {path.stat().st_size:,} bytes")
+
+        engines: list[Engine] = ["decimal", "cents"]
+        for engine in engines:
+            started = time.perf_counter()
+            process_operations(generated, io.StringIO(), engine)
+            json_time = time.perf_counter() - started
+            started = time.perf_counter()
+            process_archive(str(path), io.StringIO(), engine)
+            binary_time = time.perf_counter() - started
+            print(
+                f"{engine:>7}: json {total / json_time:12,.0f} ops/s"
+                f" | binary {total / binary_time:12,.0f} ops/s"
+                f" | speedup {json_time / binary_time:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from shutil import copy, copytree
+
+# Compares the pure-Python modules with a mypyc build of the same sources.
+# The compiled build is made in a temporary copy of the package, so the working
+# tree is never shadowed by extension modules.
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# runs in a fresh interpreter, importing capital_gains from the first path entry
+MEASURE = """
+import json, sys
+import capital_gains.money, capital_gains.tax
+from benchmarks.micro import run
+from benchmarks.throughput import run as throughput
+from benchmarks.workload import WorkloadSpec
+
+repeat, rounds, lines = map(int, sys.argv[1:])
+results = run(repeat, rounds)
+spec = WorkloadSpec(lines=lines, operations_per_line=50)
+results["ops_per_second"] = throughput(spec, "decimal", repeat)["ops_per_second"]
+modules = [capital_gains.money.__file__, capital_gains.tax.__file__]
+print(json.dumps({"modules": modules, "results": results}))
+"""
+
+
+def build_compiled(directory: Path) -> None:
+    copytree(ROOT / "capital_gains", directory / "capital_gains")
+    copy(ROOT / "setup.py", directory)
+    subprocess.run(  # noqa: S603
+        [sys.executable, "setup.py", "--quiet", "build_ext", "--inplace"],
+        cwd=directory,
+        env={**os.environ, "CAPITAL_GAINS_MYPYC": "1"},
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def measure(package_root: Path, repeat: int, rounds: int, lines: int) -> dict:
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", MEASURE, str(repeat), str(rounds), str(lines)],
+        cwd=package_root,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join([str(package_root), str(ROOT)]),
+        },
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the pure-Python and the mypyc-compiled build."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--lines", type=int, default=2_000)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        build_compiled(Path(directory))
+        pure = measure(ROOT, args.repeat, args.rounds, args.lines)
+        compiled = measure(Path(directory), args.repeat, args.rounds, args.lines)
+
+    for module in compiled["modules"]:
+        if module.endswith(".py"):
+            sys.exit(f"mypyc build was not imported: {module}")
+
+    for name, pure_value in pure["results"].items():
+        compiled_value = compiled["results"][name]
+        if name == "ops_per_second":
+            print(
+                f"{'throughput':>30}: pure {pure_value:12,.0f} ops/s"
+                f" | compiled {compiled_value:12,.0f} ops/s"
+                f" | speedup {compiled_value / pure_value:.2f}x"
+            )
+        else:
+            print(
+                f"{name:>30}: pure {pure_value:10.1f} ns"
+                f" | compiled {compiled_value:10.1f} ns"
+                f" | speedup {pure_value / compiled_value:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
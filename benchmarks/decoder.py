@@ -0,0 +1,41 @@
+import sys
+import timeit
+from collections.abc import Callable
+
+from capital_gains.cli import load_json_line, load_json_line_cents
+from capital_gains.decoder import decode_operations, decode_operations_cents
+
+from .workload import WorkloadSpec, generate_lines
+
+# Compares the schema-specialized decoder with the generic json.loads path.
+
+
+def best_of(parse: Callable[[str], object], lines: list[str], repeat: int) -> float:
+    return min(
+        timeit.repeat(lambda: [parse(line) for line in lines], number=1, repeat=repeat)
+    )
+
+
+def main() -> None:
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    generated = list(
+        generate_lines(WorkloadSpec(lines=lines, operations_per_line=operations))
+    )
+    total = lines * operations
+
+    for name, reference, specialized in [
+        ("Operation", load_json_line, decode_operations),
+        ("cents", load_json_line_cents, decode_operations_cents),
+    ]:
+        reference_time = best_of(reference, generated, repeat=5)
+        specialized_time = best_of(specialized, generated, repeat=5)
+        print(
+            f"{name:>9}: json {total / reference_time:12,.0f} ops/s"
+            f" | decoder {total / specialized_time:12,.0f} ops/s"
+            f" | speedup {reference_time / specialized_time:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
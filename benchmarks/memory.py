@@ -0,0 +1,38 @@
+import sys
+import tracemalloc
+
+from capital_gains.cli import parse_json_line
+from capital_gains.tax import process_operations_batch
+
+from .workload import WorkloadSpec, generate_lines
+
+# Measures the memory retained per operation: the parsed Operation plus the
+# OperationResult (and its new_state) kept by process_operations_batch.
+
+
+def measure(count: int) -> dict[str, float]:
+    (line,) = generate_lines(WorkloadSpec(lines=1, operations_per_line=count))
+    tracemalloc.start()
+    operations = parse_json_line(line)
+    after_parse, _ = tracemalloc.get_traced_memory()
+    results = process_operations_batch(operations)
+    after_batch, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "operations": len(results),
+        "operation_bytes": after_parse / count,
+        "result_bytes": (after_batch - after_parse) / count,
+        "total_bytes": after_batch / count,
+    }
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    report = measure(count)
+    print(f"memory retained for {report.pop('operations'):.0f} operations")
+    for name, value in report.items():
+        print(f"{name:>16}: {value:8.1f} per operation")
+
+
+if __name__ == "__main__":
+    main()
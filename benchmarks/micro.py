@@ -0,0 +1,149 @@
+import argparse
+import json
+import sys
+import timeit
+from collections.abc import Callable, Sequence
+from decimal import Decimal
+from pathlib import Path
+
+from capital_gains.cli import parse_json_line
+from capital_gains.money import Money
+from capital_gains.tax import (
+    InvestmentState,
+    Operation,
+    handle_buy,
+    handle_sell,
+    process_operations_batch,
+)
+
+from .workload import WorkloadSpec, generate_lines
+
+# Microbenchmarks for the hot paths, compared against a committed baseline.
+# Baselines depend on the machine: record them on the machine running the gate.
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.10  # fail when a benchmark is 10% slower than baseline
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    price = Money("25.37")
+    other = Money("3.11")
+    state = InvestmentState(
+        quantity=1_000,
+        weighted_average_price=Money("20.00"),
+        accumulated_loss=Money("150.00"),
+    )
+    buy = Operation(operation="buy", unit_cost=Money("22.13"), quantity=300)
+    sell = Operation(operation="sell", unit_cost=Money("31.57"), quantity=900)
+    (line,) = generate_lines(WorkloadSpec(lines=1, operations_per_line=100))
+    batch = parse_json_line(line)
+    amount = Decimal("25.37")
+
+    return {
+        "money_init": lambda: Money(amount),
+        "money_add": lambda: price + other,
+        "money_sub": lambda: price - other,
+        "money_mul": lambda: price * 300,
+        "money_truediv": lambda: price / 7,
+        "money_lt": lambda: price < other,
+        "money_eq": lambda: price == other,
+        "handle_buy": lambda: handle_buy(state, buy),
+        "handle_sell": lambda: handle_sell(state, sell),
+        "process_operations_batch_100": lambda: process_operations_batch(batch),
+    }
+
+
+def measure(case: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(case)
+    number, _ = timer.autorange()
+    # nanoseconds per call, best of repeat to filter out noise
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(repeat: int, rounds: int, selected: Sequence[str] = ()) -> dict[str, float]:
+    cases = {
+        name: case
+        for name, case in build_cases().items()
+        if not selected or name in selected
+    }
+    # noise comes in bursts, so whole rounds are interleaved and the best kept
+    results = {name: float("inf") for name in cases}
+    for _ in range(rounds):
+        for name, case in cases.items():
+            results[name] = min(results[name], measure(case, repeat))
+    return {name: round(nanoseconds, 1) for name, nanoseconds in results.items()}
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    regressions: list[str] = []
+    for name, nanoseconds in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:>30}: {nanoseconds:12.1f} ns (no baseline)")
+            continue
+        change = nanoseconds / reference - 1
+        status = "REGRESSION" if change > threshold else "ok"
+        print(
+            f"{name:>30}: {nanoseconds:12.1f} ns"
+            f" | baseline {reference:12.1f} ns | {change:+7.1%} {status}"
+        )
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmarks for Money arithmetic and the tax handlers."
+    )
+    parser.add_argument("command", choices=["record", "compare"])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="times a regressed benchmark is measured again before failing",
+    )
+    parser.add_argument(
+        "--only", action="append", default=[], help="benchmark name to run"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    results = run(args.repeat, args.rounds, args.only)
+
+    if args.command == "record":
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        for name, nanoseconds in results.items():
+            print(f"{name:>30}: {nanoseconds:12.1f} ns")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.threshold)
+    for _ in range(args.retries):
+        if not regressions:
+            break
+        # timings are noisy: keep the best of every attempt for regressed cases
+        print(f"Measuring again: {', '.join(regressions)}")
+        retry = run(args.repeat, args.rounds, regressions)
+        results.update({name: min(results[name], retry[name]) for name in retry})
+        regressions = compare(
+            {name: results[name] for name in regressions},
+            baseline,
+            args.threshold,
+        )
+    if regressions:
+        print(f"Regressions above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
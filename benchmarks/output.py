@@ -0,0 +1,67 @@
+import io
+import os
+import sys
+import time
+from collections.abc import Buffer
+
+from capital_gains.cli import process_line
+from capital_gains.output import FLUSH_POLICIES, BufferedLineWriter
+
+from .workload import WorkloadSpec, generate_lines
+
+# Writes the CLI output of a workload to /dev/null through an unbuffered
+# text stream (one system call per write, like an unbuffered pipe) and counts
+# the system calls made with and without each flush policy.
+
+
+class CountingDevNull(io.RawIOBase):
+    def __init__(self) -> None:
+        self.fd = os.open(os.devnull, os.O_WRONLY)
+        self.syscalls = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Buffer) -> int:
+        self.syscalls += 1
+        return os.write(self.fd, data)
+
+    def close(self) -> None:
+        if not self.closed:
+            os.close(self.fd)
+        super().close()
+
+
+def measure(lines: list[str], policy: str | None) -> tuple[int, float]:
+    raw = CountingDevNull()
+    # a one byte buffer passes every write straight through to the raw file
+    stream = io.TextIOWrapper(io.BufferedWriter(raw, 1), write_through=True)
+    started = time.perf_counter()
+    if policy is None:
+        for line in lines:
+            stream.write(line)
+    else:
+        with BufferedLineWriter(stream, FLUSH_POLICIES[policy]) as output:
+            for line in lines:
+                output.write(line)
+    elapsed = time.perf_counter() - started
+    syscalls = raw.syscalls
+    stream.close()
+    return syscalls, elapsed
+
+
+def main() -> None:
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    generated = generate_lines(WorkloadSpec(lines=lines, operations_per_line=2))
+    output_lines = [process_line(line) for line in generated]
+
+    for policy in [None, *FLUSH_POLICIES]:
+        syscalls, elapsed = measure(output_lines, policy)
+        print(
+            f"{policy or 'direct':>9}: {syscalls:8,} write calls"
+            f" | {lines / elapsed:12,.0f} lines/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
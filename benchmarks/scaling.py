@@ -0,0 +1,84 @@
+import argparse
+import io
+import os
+import sys
+import time
+from collections.abc import Sequence
+from typing import get_args
+
+from capital_gains.parallel import Backend, process_operations_parallel
+from capital_gains.tax import ENGINES, Engine
+
+from .workload import WorkloadSpec, generate_lines
+
+# Throughput of --jobs with each backend, from one worker up to every core.
+# Threads only scale on a free-threaded build (python3.14t).
+
+
+def worker_counts(maximum: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 < maximum:
+        counts.append(counts[-1] * 2)
+    if maximum > 1:
+        counts.append(maximum)
+    return counts
+
+
+def measure(
+    data: str, backend: Backend, workers: int, engine: Engine, chunk_size: int
+) -> float:
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        process_operations_parallel(
+            io.StringIO(data),
+            devnull,
+            jobs=workers,
+            chunk_size=chunk_size,
+            engine=engine,
+            backend=backend,
+        )
+        return time.perf_counter() - start
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Scaling of the parallel backends from 1 to N workers."
+    )
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--operations-per-line", type=int, default=20)
+    parser.add_argument("--max-workers", type=int, default=os.process_cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument(
+        "--backend",
+        choices=get_args(Backend.__value__),
+        action="append",
+        help="backend to measure, may be repeated (default: all)",
+    )
+    parser.add_argument("--engine", choices=ENGINES, default="decimal")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    spec = WorkloadSpec(lines=args.lines, operations_per_line=args.operations_per_line)
+    data = "".join(generate_lines(spec))
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{spec}\nGIL enabled: {is_gil_enabled}")
+
+    for backend in args.backend or get_args(Backend.__value__):
+        baseline = None
+        for workers in worker_counts(args.max_workers or 1):
+            try:
+                seconds = measure(data, backend, workers, args.engine, args.chunk_size)
+            except ImportError as error:
+                print(f"{backend:>11}: unavailable ({error})")
+                break
+            baseline = baseline or seconds
+            print(
+                f"{backend:>11} x{workers:<3}: {args.lines / seconds:10,.0f} lines/s"
+                f" | speedup {baseline / seconds:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import io
+import os
+import time
+import tracemalloc
+from collections.abc import Sequence
+
+from capital_gains.cli import process_operations
+from capital_gains.tax import ENGINES, Engine
+
+from .workload import WorkloadSpec, generate_lines
+
+# End-to-end throughput of cli.process_operations over a synthetic workload.
+
+
+def peak_kib(data: str, engine: Engine) -> float:
+    # traced separately from the timed runs, which tracemalloc would slow down;
+    # the input is buffered before tracing starts, so only the pipeline counts
+    source = io.StringIO(data)
+    with open(os.devnull, "w") as devnull:
+        tracemalloc.start()
+        process_operations(source, devnull, engine)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run(spec: WorkloadSpec, engine: Engine, repeat: int) -> dict[str, float]:
+    data = "".join(generate_lines(spec))
+    best = float("inf")
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            process_operations(io.StringIO(data), devnull, engine)
+            best = min(best, time.perf_counter() - start)
+    return {
+        "seconds": best,
+        "ops_per_second": spec.lines * spec.operations_per_line / best,
+        "lines_per_second": spec.lines / best,
+        "peak_kib": peak_kib(data, engine),
+    }
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    defaults = WorkloadSpec()
+    parser = argparse.ArgumentParser(
+        description="End-to-end throughput of the CLI on a synthetic workload."
+    )
+    parser.add_argument("--lines", type=int, default=defaults.lines)
+    parser.add_argument(
+        "--operations-per-line", type=int, default=defaults.operations_per_line
+    )
+    parser.add_argument("--sell-ratio", type=float, default=defaults.sell_ratio)
+    parser.add_argument("--volatility", type=float, default=defaults.volatility)
+    parser.add_argument(
+        "--exemption-crossing-rate",
+        type=float,
+        default=defaults.exemption_crossing_rate,
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        action="append",
+        help="engine to measure, may be repeated (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    spec = WorkloadSpec(
+        lines=args.lines,
+        operations_per_line=args.operations_per_line,
+        sell_ratio=args.sell_ratio,
+        volatility=args.volatility,
+        exemption_crossing_rate=args.exemption_crossing_rate,
+        seed=args.seed,
+    )
+    print(spec)
+    for engine in args.engine or ENGINES:
+        report = run(spec, engine, args.repeat)
+        print(
+            f"{engine:>8}: {report['ops_per_second']:12,.0f} ops/s"
+            f" | {report['lines_per_second']:10,.0f} lines/s"
+            f" | {report['seconds']:8.3f} s"
+            f" | peak {report['peak_kib']:,.0f} KiB allocated"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import json
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from capital_gains.tax import EXEMPTION_LIMIT
+
+if TYPE_CHECKING:
+    from capital_gains.cli import RawOperation
+
+# Deterministic synthetic workload: the same spec always yields the same lines.
+
+EXEMPTION_LIMIT_VALUE = float(EXEMPTION_LIMIT.amount)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkloadSpec:
+    lines: int = 1_000
+    operations_per_line: int = 20
+    sell_ratio: float = 0.5  # chance of selling when shares are held
+    volatility: float = 0.05  # standard deviation of each price move
+    exemption_crossing_rate: float = 0.3  # sells worth more than the limit
+    initial_price: float = 25.0
+    seed: int = 42
+
+
+def next_price(rng: random.Random, price: float, volatility: float) -> float:
+    return max(0.01, round(price * math.exp(rng.gauss(0, volatility)), 2))
+
+
+def generate_operations(spec: WorkloadSpec, rng: random.Random) -> list[RawOperation]:
+    operations: list[RawOperation] = []
+    price = spec.initial_price
+    held = 0
+    for _ in range(spec.operations_per_line):
+        price = next_price(rng, price, spec.volatility)
+        # quantity that makes the operation value cross the exemption limit
+        crossing_quantity = math.floor(EXEMPTION_LIMIT_VALUE / price) + 1
+        if held and rng.random() < spec.sell_ratio:
+            if rng.random() < spec.exemption_crossing_rate:
+                low = min(crossing_quantity, held)
+                quantity = rng.randint(low, held)
+            else:
+                quantity = rng.randint(1, max(1, min(held, crossing_quantity - 1)))
+            operations.append(
+                {"operation": "sell", "unit-cost": price, "quantity": quantity}
+            )
+            held -= quantity
+        else:
+            quantity = rng.randint(1, 2 * crossing_quantity)
+            operations.append(
+                {"operation": "buy", "unit-cost": price, "quantity": quantity}
+            )
+            held += quantity
+    return operations
+
+
+def generate_lines(spec: WorkloadSpec) -> Iterator[str]:
+    rng = random.Random(spec.seed)
+    for _ in range(spec.lines):
+        yield json.dumps(generate_operations(spec, rng)) + "\n"
@@ -1,10 +1,283 @@
 import sys
+from collections.abc import Sequence
+from io import Writer
 
 from .cli import process_operations
+from .tax import ENGINES, Engine
 
+# argparse is the largest import of the CLI and a run without options does
+# not need it
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
 
-def main() -> None:
-    process_operations(sys.stdin, sys.stdout)
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="capital-gains",
+        description="Calculate the tax due on stock market operations.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes (0 uses every available core)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["process", "thread", "interpreter"],
+        default="process",
+        help="workers used by --jobs: processes, threads (parallel on"
+        " free-threaded builds) or subinterpreters",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="lines sent to a worker at a time with --jobs or --shards",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="worker processes that split each line by ticker (0 uses every core)",
+    )
+    parser.add_argument(
+        "--input",
+        default=None,
+        help="read a JSON lines file split in newline-aligned ranges across --jobs",
+    )
+    parser.add_argument(
+        "--binary",
+        default=None,
+        help="read operations from a binary archive (see capital-gains-convert)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read operation arrays element by element, for very long lines",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="decimal",
+        help="calculation engine: Money objects or integer cents (faster)",
+    )
+    parser.add_argument(
+        "--flush",
+        choices=["size", "lines", "time", "immediate"],
+        default=None,
+        help="collect output lines and write them by size, line count, time"
+        " or immediately",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=None,
+        help="write the final state of every line as JSON lines to this file",
+    )
+    parser.add_argument(
+        "--audit-file",
+        default=None,
+        help="write a full audit record per operation as JSON lines to this file",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="write per-stage timings and counters as JSON to stderr at exit",
+    )
+    parser.add_argument(
+        "--stats-file",
+        default=None,
+        help="write the --stats report to this file instead of stderr",
+    )
+    parser.add_argument(
+        "--state-store",
+        default=None,
+        help="SQLite file with the last state of each account",
+    )
+    parser.add_argument(
+        "--account",
+        default=None,
+        help="account whose stored state the operations continue from",
+    )
+    args = parser.parse_args(argv)
+    if (args.state_store is None) != (args.account is None):
+        parser.error("--state-store and --account must be used together")
+    args.stats = args.stats or args.stats_file is not None
+    if args.stats and (args.stream or args.jobs != 1):
+        parser.error("--stats cannot be combined with --stream or --jobs")
+    if args.state_store is not None and (args.stream or args.jobs != 1 or args.stats):
+        parser.error(
+            "--state-store cannot be combined with --stream, --jobs or --stats"
+        )
+    if args.shards is not None and (
+        args.stream
+        or args.jobs != 1
+        or args.stats
+        or args.state_store is not None
+        or args.backend != "process"
+    ):
+        parser.error(
+            "--shards cannot be combined with --stream, --jobs, --stats,"
+            " --state-store or --backend (it always uses processes)"
+        )
+    if args.binary is not None and (
+        args.stream
+        or args.jobs != 1
+        or args.stats
+        or args.state_store is not None
+        or args.shards is not None
+    ):
+        parser.error("--binary only supports the default sequential mode")
+    if args.input is not None and (
+        args.stream
+        or args.stats
+        or args.state_store is not None
+        or args.shards is not None
+        or args.binary is not None
+        or args.backend != "process"
+    ):
+        # --input splits the file across worker processes, never threads
+        parser.error("--input can only be combined with --jobs and --engine")
+    args.detailed = args.state_file is not None or args.audit_file is not None
+    if args.detailed and (
+        args.stream
+        or args.jobs != 1
+        or args.stats
+        or args.engine != "decimal"
+        or args.state_store is not None
+        or args.shards is not None
+        or args.binary is not None
+        or args.input is not None
+    ):
+        parser.error(
+            "--state-file and --audit-file only support the default sequential"
+            " mode with the decimal engine"
+        )
+    if args.stream and args.jobs != 1:
+        parser.error("--stream cannot be combined with --jobs")
+    if args.stream and args.engine != "decimal":
+        parser.error("--stream only supports the decimal engine")
+    return args
+
+
+def run_with_stats(engine: Engine, stats_file: str | None, output: Writer[str]) -> None:
+    from .stats import PipelineStats, process_operations_with_stats
+
+    stats = PipelineStats()
+    try:
+        process_operations_with_stats(sys.stdin, output, stats, engine)
+    finally:
+        # the report is written even when processing fails half way
+        if stats_file is None:
+            sys.stderr.write(stats.to_json() + "\n")
+        else:
+            with open(stats_file, "w") as report:
+                report.write(stats.to_json() + "\n")
+
+
+def run_detailed(
+    state_file: str | None, audit_file: str | None, output: Writer[str]
+) -> None:
+    from contextlib import ExitStack
+
+    from .audit import process_operations_detailed
+
+    with ExitStack() as files:
+        state_sink = (
+            None if state_file is None else files.enter_context(open(state_file, "w"))
+        )
+        audit_sink = (
+            None if audit_file is None else files.enter_context(open(audit_file, "w"))
+        )
+        process_operations_detailed(sys.stdin, output, state_sink, audit_sink)
+
+
+def run(args: argparse.Namespace, output: Writer[str]) -> None:
+    if args.stream:
+        from .streaming import process_operations_streaming
+
+        process_operations_streaming(sys.stdin, output)
+        return
+
+    if args.state_store is not None:
+        from .store import StateStore, process_account_operations
+
+        with StateStore(args.state_store) as store:
+            process_account_operations(
+                sys.stdin, output, store, args.account, args.engine
+            )
+        return
+
+    if args.stats:
+        run_with_stats(args.engine, args.stats_file, output)
+        return
+
+    if args.detailed:
+        run_detailed(args.state_file, args.audit_file, output)
+        return
+
+    if args.input is not None:
+        from .chunked import process_file_chunked
+
+        process_file_chunked(args.input, output, args.jobs, engine=args.engine)
+        return
+
+    if args.binary is not None:
+        from .binary import process_archive
+
+        process_archive(args.binary, output, args.engine)
+        return
+
+    if args.shards is not None:
+        from .parallel import DEFAULT_CHUNK_SIZE
+        from .sharded import process_operations_sharded
+
+        process_operations_sharded(
+            sys.stdin,
+            output,
+            shards=args.shards,
+            chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+            engine=args.engine,
+        )
+        return
+
+    if args.jobs == 1:
+        process_operations(sys.stdin, output, args.engine)
+        return
+
+    from .parallel import DEFAULT_CHUNK_SIZE, process_operations_parallel
+
+    process_operations_parallel(
+        sys.stdin,
+        output,
+        jobs=args.jobs,
+        chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+        engine=args.engine,
+        backend=args.backend,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # the default sequential run, what parse_args and run give for no options
+        process_operations(sys.stdin, sys.stdout)
+        return
+
+    args = parse_args(argv)
+
+    if args.flush is None:
+        run(args, sys.stdout)
+        return
+
+    from .output import FLUSH_POLICIES, BufferedLineWriter
+
+    with BufferedLineWriter(sys.stdout, FLUSH_POLICIES[args.flush]) as output:
+        run(args, output)
 
 
 if __name__ == "__main__":
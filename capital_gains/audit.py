@@ -0,0 +1,150 @@
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from io import Writer
+
+from .cli import parse_json_line, readlines
+from .encoder import encode_taxes
+from .money import Money
+from .tax import (
+    EXEMPTION_LIMIT,
+    INITIAL_INVESTMENT,
+    InvestmentState,
+    Operation,
+    iter_taxes,
+    process_operation,
+)
+
+# Detail levels beyond the taxes: the final state of every line and a full
+# audit record per operation, each written to its own sink as JSON lines.
+# Only used when a sink is given, so the taxes-only path never computes or
+# allocates any of these fields.
+
+
+@dataclass(frozen=True, slots=True)
+class AuditRecord:
+    operation: Operation
+    previous_state: InvestmentState
+    new_state: InvestmentState
+    tax: Money
+    total_operation_value: Money
+    # sells only
+    gross_profit: Money | None = None
+    loss_deducted: Money | None = None
+    taxable_profit: Money | None = None
+    exempt: bool | None = None
+
+
+def audit_operation(state: InvestmentState, operation: Operation) -> AuditRecord:
+    result = process_operation(state, operation)
+    total_operation_value = operation.unit_cost * operation.quantity
+    if operation.operation == "buy":
+        return AuditRecord(
+            operation, state, result.new_state, result.tax, total_operation_value
+        )
+    gross_profit = (
+        operation.unit_cost - state.weighted_average_price
+    ) * operation.quantity
+    return AuditRecord(
+        operation,
+        state,
+        result.new_state,
+        result.tax,
+        total_operation_value,
+        gross_profit=gross_profit,
+        loss_deducted=max(
+            Money.zero(),
+            state.accumulated_loss - result.new_state.accumulated_loss,
+        ),
+        taxable_profit=max(Money.zero(), gross_profit - state.accumulated_loss),
+        exempt=total_operation_value <= EXEMPTION_LIMIT,
+    )
+
+
+def iter_audit_records(
+    operations: Iterable[Operation], initial_state: InvestmentState = INITIAL_INVESTMENT
+) -> Iterator[AuditRecord]:
+    states: dict[str | None, InvestmentState] = {}
+    for operation in operations:
+        record = audit_operation(states.get(operation.ticker, initial_state), operation)
+        states[operation.ticker] = record.new_state
+        yield record
+
+
+def amount(money: Money | None) -> float | None:
+    return None if money is None else float(money.amount)
+
+
+def state_fields(state: InvestmentState) -> dict[str, object]:
+    return {
+        "quantity": state.quantity,
+        "weighted-average-price": amount(state.weighted_average_price),
+        "accumulated-loss": amount(state.accumulated_loss),
+    }
+
+
+def format_state(line: int, ticker: str | None, state: InvestmentState) -> str:
+    return json.dumps({"line": line, "ticker": ticker, **state_fields(state)})
+
+
+def format_audit_record(line: int, index: int, record: AuditRecord) -> str:
+    operation = record.operation
+    return json.dumps(
+        {
+            "line": line,
+            "index": index,
+            "operation": operation.operation,
+            "ticker": operation.ticker,
+            "unit-cost": amount(operation.unit_cost),
+            "quantity": operation.quantity,
+            "total-operation-value": amount(record.total_operation_value),
+            "gross-profit": amount(record.gross_profit),
+            "loss-deducted": amount(record.loss_deducted),
+            "taxable-profit": amount(record.taxable_profit),
+            "exempt": record.exempt,
+            "tax": amount(record.tax),
+            "state": state_fields(record.new_state),
+        }
+    )
+
+
+def collect_taxes(
+    operations: Iterable[Operation],
+) -> tuple[list[Money], dict[str | None, InvestmentState]]:
+    taxes: list[Money] = []
+    generator = iter_taxes(operations)
+    while True:
+        try:
+            taxes.append(next(generator))
+        except StopIteration as finished:
+            return taxes, finished.value
+
+
+def process_operations_detailed(
+    reader_stream: Iterable[str],
+    writer_stream: Writer[str],
+    state_sink: Writer[str] | None = None,
+    audit_sink: Writer[str] | None = None,
+) -> None:
+    for line_number, line in enumerate(readlines(reader_stream), start=1):
+        operations = parse_json_line(line)
+        if audit_sink is None:
+            taxes, final_states = collect_taxes(operations)
+        else:
+            taxes = []
+            final_states = {}
+            audit_lines: list[str] = []
+            for index, record in enumerate(iter_audit_records(operations)):
+                taxes.append(record.tax)
+                final_states[record.operation.ticker] = record.new_state
+                audit_lines.append(format_audit_record(line_number, index, record))
+                audit_lines.append("\n")
+            audit_sink.write("".join(audit_lines))
+        writer_stream.write(encode_taxes(taxes) + "\n")
+        if state_sink is not None:
+            state_sink.write(
+                "".join(
+                    format_state(line_number, ticker, state) + "\n"
+                    for ticker, state in final_states.items()
+                )
+            )
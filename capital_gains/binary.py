@@ -0,0 +1,154 @@
+import argparse
+import mmap
+import struct
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+from io import Writer
+from types import TracebackType
+from typing import BinaryIO, Literal, Self
+
+from .cents import CentsOperation, calculate_taxes_cents, from_cents
+from .cli import parse_json_line_cents, readlines
+from .decoder import UNIT_COST_CACHE_SIZE
+from .encoder import encode_taxes, encode_taxes_cents
+from .tax import Engine, Operation, calculate_taxes
+
+# Fixed-width binary archive of operations, so replays skip JSON parsing.
+# After the magic bytes every record is three little-endian int64 values:
+# (op code, unit cost in cents, quantity). A line starts with a LINE_START
+# record whose quantity is the number of operations that follow. Records are
+# 8-byte aligned, so each column is a strided view of the mapped file.
+
+MAGIC = b"CGOPS\x00\x00\x01"
+RECORD = struct.Struct("<qqq")
+FIELDS = 3
+BUY, SELL, LINE_START = 0, 1, 2
+OPERATION_CODES = {"buy": BUY, "sell": SELL}
+OPERATION_NAMES: tuple[Literal["buy"], Literal["sell"]] = ("buy", "sell")
+
+type Columns = tuple[memoryview, memoryview, memoryview]  # codes, costs, quantities
+
+# prices repeat a lot, so the Money for each unit cost is shared as in decoder
+unit_cost_money = lru_cache(maxsize=UNIT_COST_CACHE_SIZE)(from_cents)
+
+
+def encode_line(operations: Sequence[CentsOperation]) -> bytes:
+    records = [RECORD.pack(LINE_START, 0, len(operations))]
+    for operation, unit_cost, quantity, ticker in operations:
+        if ticker is not None:
+            raise ValueError("The binary format does not store tickers")
+        records.append(RECORD.pack(OPERATION_CODES[operation], unit_cost, quantity))
+    return b"".join(records)
+
+
+def convert_jsonl(reader_stream: Iterable[str], output: BinaryIO) -> int:
+    output.write(MAGIC)
+    lines = 0
+    for line in readlines(reader_stream):
+        output.write(encode_line(parse_json_line_cents(line)))
+        lines += 1
+    return lines
+
+
+class BinaryArchive:
+    def __init__(self, path: str) -> None:
+        if sys.byteorder != "little":
+            raise ValueError(
+                "Binary archives can only be mapped on little-endian hosts"
+            )
+        with open(path, "rb") as archive:
+            self._mmap = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not an operations archive: {path}")
+        if (len(self._mmap) - len(MAGIC)) % RECORD.size:
+            self._mmap.close()
+            raise ValueError(f"Truncated operations archive: {path}")
+        self._values = memoryview(self._mmap)[len(MAGIC) :].cast("q")
+
+    def iter_columns(self) -> Iterator[Columns]:
+        # views into the mapping, valid until the archive is closed
+        values = self._values
+        position = 0
+        while position < len(values):
+            code, _, count = values[position : position + FIELDS]
+            if code != LINE_START:
+                raise ValueError(f"Expected a line start at record {position // 3}")
+            start = position + FIELDS
+            position = start + count * FIELDS
+            if position > len(values):
+                raise ValueError("Truncated operations archive")
+            yield (
+                values[start:position:FIELDS],
+                values[start + 1 : position : FIELDS],
+                values[start + 2 : position : FIELDS],
+            )
+
+    def iter_cents_lines(self) -> Iterator[list[CentsOperation]]:
+        for codes, costs, quantities in self.iter_columns():
+            yield [
+                (OPERATION_NAMES[code], cost, quantity, None)
+                for code, cost, quantity in zip(codes, costs, quantities, strict=True)
+            ]
+
+    def iter_lines(self) -> Iterator[list[Operation]]:
+        for codes, costs, quantities in self.iter_columns():
+            yield [
+                Operation(OPERATION_NAMES[code], unit_cost_money(cost), quantity)
+                for code, cost, quantity in zip(codes, costs, quantities, strict=True)
+            ]
+
+    def close(self) -> None:
+        self._values.release()
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # a failed caller may still hold column views (in its frames, kept by
+        # the traceback); the mapping is then unmapped once they are freed,
+        # instead of a BufferError replacing the original exception
+        self._values.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def process_archive(
+    path: str, writer_stream: Writer[str], engine: Engine = "decimal"
+) -> None:
+    with BinaryArchive(path) as archive:
+        if engine == "cents":
+            for operations in archive.iter_cents_lines():
+                writer_stream.write(
+                    encode_taxes_cents(calculate_taxes_cents(operations)) + "\n"
+                )
+        else:
+            for operations in archive.iter_lines():
+                writer_stream.write(encode_taxes(calculate_taxes(operations)) + "\n")
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="capital-gains-convert",
+        description="Convert JSON lines from stdin into a binary operations archive.",
+    )
+    parser.add_argument("output", help="archive file to write")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    with open(args.output, "wb") as output:
+        convert_jsonl(sys.stdin, output)
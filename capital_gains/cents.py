@@ -0,0 +1,145 @@
+import re
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+
+from capital_gains.money import DEFAULT_CURRENCY, TWOPLACES, Money
+from capital_gains.tax import (
+    EXEMPTION_LIMIT,
+    INITIAL_INVESTMENT,
+    TAX_RATE,
+    InvestmentState,
+    Operation,
+    OperationResult,
+)
+
+# Integer-cents engine: amounts are scaled integers instead of Money objects.
+# Every step reproduces the rounding done by Money (quantize to two places
+# using the default ROUND_HALF_EVEN context), so results are identical.
+
+type CentsState = tuple[int, int, int]  # quantity, weighted average, loss
+# operation, unit cost, quantity, ticker
+type CentsOperation = tuple[str, int, int, str | None]
+
+PLAIN_DECIMAL = re.compile(r"(-?)([0-9]+)(?:\.([0-9]+))?")
+
+
+def to_cents(amount: Decimal) -> int:
+    return int(amount.quantize(TWOPLACES).scaleb(2))
+
+
+def from_cents(cents: int) -> Money:
+    return Money(Decimal(cents).scaleb(-2))
+
+
+def divide_half_even(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    doubled_remainder = 2 * remainder
+    if doubled_remainder > denominator or (
+        doubled_remainder == denominator and quotient % 2
+    ):
+        quotient += 1
+    return quotient
+
+
+def parse_cents(text: str) -> int:
+    integer, _, fraction = text.partition(".")
+    if len(fraction) == 2 and fraction.isdecimal():
+        return int(integer + fraction)  # already has two decimal places
+
+    match = PLAIN_DECIMAL.fullmatch(text)
+    if match is None:
+        # exponents and other spellings are rare, let Decimal handle them
+        return to_cents(Decimal(text))
+
+    sign, integer, fraction = match.groups()
+    fraction = fraction or ""
+    cents = int(integer) * 100 + int(fraction[:2].ljust(2, "0"))
+    rest = fraction[2:].rstrip("0")
+    if rest and (rest > "5" or (rest == "5" and cents % 2)):
+        cents += 1
+    return -cents if sign else cents
+
+
+TAX_RATE_NUMERATOR, TAX_RATE_DENOMINATOR = TAX_RATE.as_integer_ratio()
+EXEMPTION_LIMIT_CENTS = to_cents(EXEMPTION_LIMIT.amount)
+INITIAL_CENTS_STATE: CentsState = (0, 0, 0)
+
+
+def iter_cents_results(
+    operations: Iterable[CentsOperation], state: CentsState = INITIAL_CENTS_STATE
+) -> Iterator[tuple[int, CentsState]]:
+    quantity, average, loss = state
+    ticker: str | None = None
+    parked: dict[str | None, CentsState] = {}
+    for operation, unit_cost, operation_quantity, operation_ticker in operations:
+        if operation_ticker != ticker:
+            # same per-ticker bookkeeping as tax.calculate_taxes
+            parked[ticker] = (quantity, average, loss)
+            ticker = operation_ticker
+            quantity, average, loss = parked.pop(ticker, state)
+        tax = 0
+        if operation == "buy":
+            new_quantity = quantity + operation_quantity
+            average = divide_half_even(
+                average * quantity + unit_cost * operation_quantity, new_quantity
+            )
+            quantity = new_quantity
+        elif operation == "sell":
+            gross_profit = (unit_cost - average) * operation_quantity
+            taxable_profit = gross_profit - loss
+            loss = -taxable_profit if taxable_profit < 0 else 0
+            quantity -= operation_quantity
+            if (
+                taxable_profit > 0
+                and unit_cost * operation_quantity > EXEMPTION_LIMIT_CENTS
+            ):
+                tax = divide_half_even(
+                    taxable_profit * TAX_RATE_NUMERATOR, TAX_RATE_DENOMINATOR
+                )
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+        yield tax, (quantity, average, loss)
+
+
+def calculate_taxes_cents(
+    operations: Iterable[CentsOperation], state: CentsState = INITIAL_CENTS_STATE
+) -> list[int]:
+    return [tax for tax, _ in iter_cents_results(operations, state)]
+
+
+def money_to_cents(money: Money) -> int:
+    if money.currency != DEFAULT_CURRENCY:
+        raise ValueError(f"Unsupported currency: {money.currency}")
+    return to_cents(money.amount)
+
+
+def process_operations_batch_cents(
+    operations: Iterable[Operation], initial_state: InvestmentState = INITIAL_INVESTMENT
+) -> list[OperationResult]:
+    state = (
+        initial_state.quantity,
+        money_to_cents(initial_state.weighted_average_price),
+        money_to_cents(initial_state.accumulated_loss),
+    )
+    cents_operations = (
+        (
+            operation.operation,
+            money_to_cents(operation.unit_cost),
+            operation.quantity,
+            operation.ticker,
+        )
+        for operation in operations
+    )
+    return [
+        OperationResult(
+            new_state=InvestmentState(
+                quantity=quantity,
+                weighted_average_price=from_cents(average),
+                accumulated_loss=from_cents(loss),
+            ),
+            tax=from_cents(tax),
+        )
+        for tax, (quantity, average, loss) in iter_cents_results(
+            cents_operations, state
+        )
+    ]
@@ -0,0 +1,94 @@
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+
+from .money import Money
+from .tax import INITIAL_INVESTMENT, InvestmentState, Operation, process_operation
+
+# Operation history that keeps the taxes plus a checkpoint of the state every
+# `interval` operations. Amending the operation at position i only replays from
+# the nearest checkpoint before i, and replay stops as soon as the new state
+# matches the old run at one of its later checkpoints: from there on, the same
+# state and the same operations produce the same taxes.
+# The history is a single position: tickers are not tracked separately.
+
+DEFAULT_CHECKPOINT_INTERVAL = 64
+
+
+class CheckpointedHistory:
+    def __init__(
+        self,
+        operations: Iterable[Operation] = (),
+        initial_state: InvestmentState = INITIAL_INVESTMENT,
+        interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> None:
+        if interval < 1:
+            raise ValueError(f"Invalid checkpoint interval: {interval}")
+        self.interval = interval
+        self.operations: list[Operation] = list(operations)
+        self.taxes: list[Money] = []
+        # positions[k] is the number of operations applied to reach states[k]
+        self.positions: list[int] = [0]
+        self.states: list[InvestmentState] = [initial_state]
+        self.replayed = 0  # operations calculated by the last change
+        self._replay(start=0, converge_from=len(self.operations), shift=0, old={})
+
+    def edit(self, index: int, operation: Operation) -> None:
+        self.splice(index, 1, [operation])
+
+    def insert(self, index: int, operation: Operation) -> None:
+        self.splice(index, 0, [operation])
+
+    def delete(self, index: int) -> None:
+        self.splice(index, 1, [])
+
+    def append(self, operations: Iterable[Operation]) -> None:
+        self.splice(len(self.operations), 0, list(operations))
+
+    def splice(self, index: int, removed: int, inserted: Sequence[Operation]) -> None:
+        if not 0 <= index <= index + removed <= len(self.operations):
+            raise IndexError(f"Invalid range: {index}:{index + removed}")
+        # old checkpoints after the changed range may be reached again
+        old = {
+            position: state
+            for position, state in zip(self.positions, self.states, strict=True)
+            if position >= index + removed
+        }
+        self.operations[index : index + removed] = inserted
+        # the checkpoint at index itself is still valid: it comes before the change
+        kept = bisect_right(self.positions, index)
+        del self.positions[kept:], self.states[kept:]
+        self._replay(
+            self.positions[-1],
+            converge_from=index + len(inserted),
+            shift=len(inserted) - removed,
+            old=old,
+        )
+
+    def _replay(
+        self,
+        start: int,
+        converge_from: int,
+        shift: int,
+        old: dict[int, InvestmentState],
+    ) -> None:
+        state = self.states[-1]
+        old_taxes = self.taxes[start:]
+        del self.taxes[start:]
+        self.replayed = 0
+        for position in range(start, len(self.operations)):
+            old_position = position - shift
+            if position >= converge_from and old.get(old_position) == state:
+                # converged: the rest of the old run is still valid, shifted
+                self.taxes.extend(old_taxes[old_position - start :])
+                for checkpoint, old_state in old.items():
+                    if checkpoint + shift > self.positions[-1]:
+                        self.positions.append(checkpoint + shift)
+                        self.states.append(old_state)
+                return
+            if position > start and (position - start) % self.interval == 0:
+                self.positions.append(position)
+                self.states.append(state)
+            result = process_operation(state, self.operations[position])
+            self.taxes.append(result.tax)
+            state = result.new_state
+            self.replayed += 1
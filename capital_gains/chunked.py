@@ -0,0 +1,84 @@
+import mmap
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import Writer
+
+from .cli import process_line
+from .parallel import resolve_jobs
+from .tax import Engine
+
+# File input split into byte ranges that end at newlines. Every worker maps
+# the file and only touches the pages of its own range, so no process reads
+# the whole file; outputs are written back in range order.
+
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024  # upper bound on a range, bounds memory
+
+type ByteRange = tuple[int, int]
+
+
+def split_ranges(path: str, parts: int) -> Iterator[ByteRange]:
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    with (
+        open(path, "rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        start = 0
+        for part in range(1, parts + 1):
+            target = size * part // parts
+            if target <= start:
+                continue
+            newline = mapped.find(b"\n", target - 1)
+            end = size if newline == -1 else newline + 1
+            yield start, end
+            start = end
+            if start == size:
+                return
+
+
+def process_range(path: str, byte_range: ByteRange, engine: Engine = "decimal") -> str:
+    start, end = byte_range
+    output: list[str] = []
+    with (
+        open(path, "rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        while start < end:
+            newline = mapped.find(b"\n", start, end)
+            stop = end if newline == -1 else newline + 1
+            line = mapped[start:stop].decode()
+            if line.strip():
+                output.append(process_line(line, engine))
+            start = stop
+    return "".join(output)
+
+
+def process_file_chunked(
+    path: str,
+    writer_stream: Writer[str],
+    jobs: int = 0,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    engine: Engine = "decimal",
+) -> None:
+    workers = resolve_jobs(jobs)
+    # at least one range per worker, more when ranges would exceed chunk_bytes
+    parts = max(workers, -(-os.path.getsize(path) // chunk_bytes))
+    ranges = split_ranges(path, parts)
+
+    if workers == 1:
+        for byte_range in ranges:
+            writer_stream.write(process_range(path, byte_range, engine))
+        return
+
+    pending: deque[Future[str]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for byte_range in ranges:
+            if len(pending) >= workers * 2:
+                writer_stream.write(pending.popleft().result())
+            pending.append(executor.submit(process_range, path, byte_range, engine))
+
+        while pending:
+            writer_stream.write(pending.popleft().result())
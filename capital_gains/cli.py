@@ -1,23 +1,32 @@
-import json
 from collections.abc import Iterable, Iterator
 from io import Writer
-from typing import Literal, TypedDict
 
+from .encoder import encode_results, encode_tax, encode_taxes, encode_taxes_cents
 from .money import Money
 from .tax import (
+    Engine,
     Operation,
     OperationResult,
-    process_operations_batch,
+    calculate_taxes,
 )
 
-RawOperation = TypedDict(
-    "RawOperation",
-    {
-        "operation": Literal["sell", "buy"],
-        "unit-cost": float,
-        "quantity": int,
-    },
-)
+# the input schema is only used in annotations, keeping typing out of startup;
+# json, the decoder and the cents engine are imported by the paths using them
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Literal, NotRequired, TypedDict
+
+    from .cents import CentsOperation
+
+    RawOperation = TypedDict(
+        "RawOperation",
+        {
+            "operation": Literal["sell", "buy"],
+            "unit-cost": float,
+            "quantity": int,
+            "ticker": NotRequired[str],
+        },
+    )
 
 
 def readlines(reader: Iterable[str]) -> Iterator[str]:
@@ -26,28 +35,85 @@ def readlines(reader: Iterable[str]) -> Iterator[str]:
             yield line
 
 
+def parse_raw_operation(raw: RawOperation) -> Operation:
+    return Operation(
+        operation=raw["operation"],
+        unit_cost=Money(str(raw["unit-cost"])),
+        quantity=raw["quantity"],
+        ticker=raw.get("ticker"),
+    )
+
+
+def load_json_line(line: str) -> list[Operation]:
+    import json
+
+    raw_ops_list: list[RawOperation] = json.loads(line)
+    return [parse_raw_operation(raw) for raw in raw_ops_list]
+
+
 def parse_json_line(line: str) -> list[Operation]:
+    from .decoder import decode_operations
+
+    try:
+        return decode_operations(line)
+    except ValueError:
+        # anything the specialized decoder does not know goes through json
+        return load_json_line(line)
+
+
+def load_json_line_cents(line: str) -> list[CentsOperation]:
+    import json
+
+    from .cents import parse_cents
+
     raw_ops_list: list[RawOperation] = json.loads(line)
     return [
-        Operation(
-            operation=raw["operation"],
-            unit_cost=Money(str(raw["unit-cost"])),
-            quantity=raw["quantity"],
+        (
+            raw["operation"],
+            parse_cents(str(raw["unit-cost"])),
+            raw["quantity"],
+            raw.get("ticker"),
         )
         for raw in raw_ops_list
     ]
 
 
+def parse_json_line_cents(line: str) -> list[CentsOperation]:
+    from .decoder import decode_operations_cents
+
+    try:
+        return decode_operations_cents(line)
+    except ValueError:
+        return load_json_line_cents(line)
+
+
+def format_result(result: OperationResult) -> str:
+    return encode_tax(result.tax)
+
+
+def format_json(tax_list: list[OperationResult]) -> str:
+    return encode_results(tax_list)
+
+
 def dump_json(tax_list: list[OperationResult], output: Writer[str]) -> None:
-    formatted_list = [{"tax": float(res.tax.amount)} for res in tax_list]
+    output.write(format_json(tax_list) + "\n")
 
-    json.dump(formatted_list, output)
-    output.write("\n")
+
+def process_line(line: str, engine: Engine = "decimal") -> str:
+    if engine == "cents":
+        from .cents import calculate_taxes_cents
+
+        # skip Money entirely: cents from parsing to serialization
+        taxes_cents = calculate_taxes_cents(parse_json_line_cents(line))
+        return encode_taxes_cents(taxes_cents) + "\n"
+    # the CLI only prints taxes, so the allocation-free kernel is enough
+    return encode_taxes(calculate_taxes(parse_json_line(line))) + "\n"
 
 
 def process_operations(
     reader_stream: Iterable[str],
     writer_stream: Writer[str],
+    engine: Engine = "decimal",
 ) -> None:
     # functional style
     # deque hack can be used to consume lazy map without create a list
@@ -60,7 +126,4 @@ def process_operations(
     #     maxlen=0,
     # )
     for line in readlines(reader_stream):
-        dump_json(
-            process_operations_batch(parse_json_line(line)),
-            writer_stream,
-        )
+        writer_stream.write(process_line(line, engine))
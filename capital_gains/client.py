@@ -0,0 +1,63 @@
+import argparse
+import socket
+import sys
+import threading
+from collections.abc import Iterable, Sequence
+from io import Writer
+
+from .endpoint import DEFAULT_HOST, DEFAULT_PORT
+
+# Thin client for capital-gains-server: sends stdin lines and prints replies.
+# It only imports what it needs to talk to the socket, so starting it is
+# cheaper than starting the CLI.
+
+
+def connect(
+    socket_path: str | None = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+) -> socket.socket:
+    if socket_path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+        return connection
+    return socket.create_connection((host, port))
+
+
+def send_lines(connection: socket.socket, lines: Iterable[str]) -> None:
+    for line in lines:
+        if not line.strip():
+            continue
+        if not line.endswith("\n"):
+            line += "\n"
+        connection.sendall(line.encode())
+    connection.shutdown(socket.SHUT_WR)
+
+
+def request(
+    connection: socket.socket, reader_stream: Iterable[str], writer_stream: Writer[str]
+) -> None:
+    # send from a thread so large inputs cannot deadlock against the replies
+    sender = threading.Thread(
+        target=send_lines, args=(connection, reader_stream), daemon=True
+    )
+    sender.start()
+    with connection.makefile("r", encoding="utf-8", newline="\n") as replies:
+        for reply in replies:
+            writer_stream.write(reply)
+    sender.join()
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="capital-gains-client",
+        description="Send operations to a running capital-gains-server.",
+    )
+    parser.add_argument("--socket", help="Unix domain socket path")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    with connect(args.socket, args.host, args.port) as connection:
+        request(connection, sys.stdin, sys.stdout)
@@ -0,0 +1,96 @@
+import json
+from functools import lru_cache
+
+from .money import Money
+from .tax import Operation
+
+# the cents engine is imported when cents are first decoded, so the default
+# decimal path does not load it
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .cents import CentsOperation
+
+# Decoder specialized for the operation schema. json.loads turns every
+# unit-cost into a float that the CLI converts back with str() before building
+# Money; here the number literal goes straight from the token stream into
+# Money (or cents) through the parse_float hook.
+# Anything outside the schema raises ValueError so callers can fall back to
+# the generic json path, which keeps its exact behavior.
+
+# Decimal literals with up to 15 significant digits survive the float round
+# trip unchanged, so only longer literals need to go through float.
+FLOAT_EXACT_DIGITS = 15
+
+
+def normalize_number(text: str) -> str:
+    _, _, fraction = text.partition(".")
+    if len(text) <= FLOAT_EXACT_DIGITS + 1 and fraction.isdecimal():
+        return text  # common case: short plain decimal such as 10.00
+    mantissa, _, exponent = text.replace("E", "e").partition("e")
+    integer, _, fraction = mantissa.lstrip("-").partition(".")
+    significant_digits = len((integer + fraction).lstrip("0"))
+    if exponent or significant_digits > FLOAT_EXACT_DIGITS:
+        return str(float(text))
+    return text
+
+
+# Money is immutable and prices repeat a lot, so parsed unit costs are shared
+UNIT_COST_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=UNIT_COST_CACHE_SIZE)
+def parse_unit_cost(text: str) -> Money:
+    return Money(normalize_number(text))
+
+
+# marks integers that came from a JSON number with a fraction or exponent,
+# already converted to cents, apart from plain JSON integers
+class Cents(int):
+    pass
+
+
+@lru_cache(maxsize=UNIT_COST_CACHE_SIZE)
+def parse_unit_cost_cents(text: str) -> Cents:
+    from .cents import parse_cents  # cached, so only paid per new unit cost
+
+    return Cents(parse_cents(normalize_number(text)))
+
+
+OPERATION_DECODER = json.JSONDecoder(parse_float=parse_unit_cost)
+CENTS_DECODER = json.JSONDecoder(parse_float=parse_unit_cost_cents)
+
+
+def decode_operations(line: str) -> list[Operation]:
+    operations: list[Operation] = []
+    for raw in OPERATION_DECODER.decode(line):
+        unit_cost = raw["unit-cost"]
+        quantity = raw["quantity"]
+        if type(unit_cost) is int:
+            unit_cost = Money(str(unit_cost))
+        ticker = raw.get("ticker")
+        if (
+            type(unit_cost) is not Money
+            or type(quantity) is not int
+            or (ticker is not None and type(ticker) is not str)
+        ):
+            raise ValueError(f"Unexpected operation: {raw}")
+        operations.append(Operation(raw["operation"], unit_cost, quantity, ticker))
+    return operations
+
+
+def decode_operations_cents(line: str) -> list[CentsOperation]:
+    operations: list[CentsOperation] = []
+    for raw in CENTS_DECODER.decode(line):
+        unit_cost = raw["unit-cost"]
+        quantity = raw["quantity"]
+        if type(unit_cost) is int:
+            unit_cost = Cents(unit_cost * 100)
+        ticker = raw.get("ticker")
+        if (
+            type(unit_cost) is not Cents
+            or type(quantity) is not int
+            or (ticker is not None and type(ticker) is not str)
+        ):
+            raise ValueError(f"Unexpected operation: {raw}")
+        operations.append((raw["operation"], int(unit_cost), quantity, ticker))
+    return operations
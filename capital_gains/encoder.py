@@ -0,0 +1,34 @@
+from collections.abc import Iterable
+
+from .money import Money
+from .tax import OperationResult
+
+# Formats taxes exactly like json.dumps([{"tax": float(amount)}, ...]) would,
+# but straight into one string per line. json serializes floats with repr.
+
+ZERO_TAX = '{"tax": 0.0}'
+ZERO_MONEY = Money.zero()
+
+
+def encode_tax(tax: Money) -> str:
+    if tax is ZERO_MONEY:
+        return ZERO_TAX  # shared zero returned by buys and exempt sells
+    return f'{{"tax": {float(tax.amount)!r}}}'
+
+
+def encode_taxes(taxes: Iterable[Money]) -> str:
+    return "[" + ", ".join([encode_tax(tax) for tax in taxes]) + "]"
+
+
+def encode_results(results: Iterable[OperationResult]) -> str:
+    return encode_taxes([result.tax for result in results])
+
+
+def encode_tax_cents(tax: int) -> str:
+    if not tax:
+        return ZERO_TAX
+    return f'{{"tax": {tax / 100!r}}}'
+
+
+def encode_taxes_cents(taxes: Iterable[int]) -> str:
+    return "[" + ", ".join([encode_tax_cents(tax) for tax in taxes]) + "]"
@@ -0,0 +1,5 @@
+# Default address shared by capital-gains-server and capital-gains-client.
+# Kept free of imports so the thin client does not load the server.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
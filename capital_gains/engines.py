@@ -0,0 +1,80 @@
+from collections.abc import Callable, Sequence
+from importlib.util import find_spec
+
+from .cents import calculate_taxes_cents, from_cents, money_to_cents
+from .money import Money
+from .tax import InvestmentState, Operation, calculate_taxes, iter_operation_results
+
+# Registry of every implementation of the tax rules, so they can be checked
+# against the reference (process_operations_batch) with the same inputs.
+# A new engine only needs to be registered here to be covered by the
+# differential tests in tests/differential.py.
+
+type TaxEngine = Callable[[Sequence[Operation], InvestmentState], list[Money]]
+
+ENGINES: dict[str, TaxEngine] = {}
+REFERENCE_ENGINE = "reference"
+
+
+def register_engine(name: str) -> Callable[[TaxEngine], TaxEngine]:
+    def register(engine: TaxEngine) -> TaxEngine:
+        ENGINES[name] = engine
+        return engine
+
+    return register
+
+
+@register_engine(REFERENCE_ENGINE)
+def reference_taxes(
+    operations: Sequence[Operation], initial_state: InvestmentState
+) -> list[Money]:
+    return [result.tax for result in iter_operation_results(operations, initial_state)]
+
+
+@register_engine("kernel")
+def kernel_taxes(
+    operations: Sequence[Operation], initial_state: InvestmentState
+) -> list[Money]:
+    return calculate_taxes(operations, initial_state)
+
+
+@register_engine("cents")
+def cents_taxes(
+    operations: Sequence[Operation], initial_state: InvestmentState
+) -> list[Money]:
+    state = (
+        initial_state.quantity,
+        money_to_cents(initial_state.weighted_average_price),
+        money_to_cents(initial_state.accumulated_loss),
+    )
+    cents_operations = [
+        (
+            operation.operation,
+            money_to_cents(operation.unit_cost),
+            operation.quantity,
+            operation.ticker,
+        )
+        for operation in operations
+    ]
+    return [from_cents(tax) for tax in calculate_taxes_cents(cents_operations, state)]
+
+
+@register_engine("audit")
+def audit_taxes(
+    operations: Sequence[Operation], initial_state: InvestmentState
+) -> list[Money]:
+    from .audit import iter_audit_records
+
+    return [record.tax for record in iter_audit_records(operations, initial_state)]
+
+
+if find_spec("numpy") is not None:
+
+    @register_engine("scenarios")
+    def scenario_taxes(
+        operations: Sequence[Operation], initial_state: InvestmentState
+    ) -> list[Money]:
+        from .scenarios import run_scenarios
+
+        [lane] = run_scenarios(operations, [[0] * len(operations)], initial_state)
+        return [from_cents(int(tax)) for tax in lane]
@@ -0,0 +1,61 @@
+# Class decorator for the immutable value objects on the CLI hot path, used
+# instead of @dataclass(frozen=True, slots=True): importing dataclasses (and
+# inspect with it) and generating the methods took a large share of startup.
+# The class lists its fields in __slots__, in constructor argument order, and
+# sets them in __init__ with object.__setattr__. Methods defined by the class
+# itself are kept.
+
+
+def _values(instance: object) -> tuple[object, ...]:
+    fields: tuple[str, ...] = type(instance).__dict__["__slots__"]
+    return tuple(getattr(instance, name) for name in fields)
+
+
+def _repr(self: object) -> str:
+    fields: tuple[str, ...] = type(self).__dict__["__slots__"]
+    arguments = ", ".join(f"{name}={getattr(self, name)!r}" for name in fields)
+    return f"{type(self).__name__}({arguments})"
+
+
+def _eq(self: object, other: object) -> bool:
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    return _values(self) == _values(other)
+
+
+def _hash(self: object) -> int:
+    return hash(_values(self))
+
+
+def _setattr(self: object, name: str, value: object) -> None:
+    from dataclasses import FrozenInstanceError  # only paid on misuse
+
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+def _delattr(self: object, name: str) -> None:
+    from dataclasses import FrozenInstanceError
+
+    raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+def _reduce(self: object) -> tuple[type, tuple[object, ...]]:
+    # __setattr__ is blocked, so unpickling goes through the constructor
+    return type(self), _values(self)
+
+
+METHODS = {
+    "__repr__": _repr,
+    "__eq__": _eq,
+    "__hash__": _hash,
+    "__setattr__": _setattr,
+    "__delattr__": _delattr,
+    "__reduce__": _reduce,
+}
+
+
+def frozen[T: type](cls: T) -> T:
+    for name, method in METHODS.items():
+        if name not in cls.__dict__:
+            setattr(cls, name, method)
+    return cls
@@ -1,25 +1,39 @@
 from collections.abc import Sequence
-from dataclasses import InitVar, dataclass, field
 from decimal import Decimal
-from functools import total_ordering
+from functools import cache, total_ordering
+
+from .frozen import frozen
 
 TWOPLACES = Decimal("0.01")
+ZERO_AMOUNT = Decimal("0.00")
 DEFAULT_CURRENCY = "BRL"
 
 type Scalar = int | Decimal
 type DecimalConvertible = Decimal | float | str | tuple[int, Sequence[int], int]
 
 
-@dataclass(frozen=True)
+@frozen
 @total_ordering
 class Money:
-    raw_amount: InitVar[DecimalConvertible]
-    amount: Decimal = field(init=False)
-    currency: str = DEFAULT_CURRENCY
+    __slots__ = ("amount", "currency")
+    amount: Decimal
+    currency: str
 
-    def __post_init__(self, raw_amount: DecimalConvertible) -> None:
+    def __init__(
+        self, raw_amount: DecimalConvertible, currency: str = DEFAULT_CURRENCY
+    ) -> None:
         quantized_amount = Decimal(raw_amount).quantize(TWOPLACES)
         object.__setattr__(self, "amount", quantized_amount)
+        object.__setattr__(self, "currency", currency)
+
+    @classmethod
+    def _from_quantized(cls, amount: Decimal, currency: str) -> Money:
+        # skips Decimal conversion and quantize for amounts that already
+        # have two decimal places, such as sums of two Money amounts
+        money = object.__new__(cls)
+        object.__setattr__(money, "amount", amount)
+        object.__setattr__(money, "currency", currency)
+        return money
 
     def _assert_same_currency_as(self, other: Money) -> None:
         if self.currency != other.currency:
@@ -29,20 +43,32 @@ class Money:
 
     def __add__(self, other: Money) -> Money:
         self._assert_same_currency_as(other)
-        return Money(self.amount + other.amount, self.currency)
+        return Money._from_quantized(self.amount + other.amount, self.currency)
 
     def __sub__(self, other: Money) -> Money:
         self._assert_same_currency_as(other)
-        return Money(self.amount - other.amount, self.currency)
+        return Money._from_quantized(self.amount - other.amount, self.currency)
 
     def __mul__(self, scalar: Scalar) -> Money:
+        if isinstance(scalar, int):
+            return Money._from_quantized(self.amount * scalar, self.currency)
         return Money(self.amount * Decimal(scalar), self.currency)
 
-    __rmul__ = __mul__
+    def __rmul__(self, scalar: Scalar) -> Money:
+        return self * scalar
 
     def __truediv__(self, scalar: Scalar) -> Money:
         return Money(self.amount / Decimal(scalar), self.currency)
 
+    # compared and hashed often, so not through the generic frozen methods
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.amount == other.amount and self.currency == other.currency
+
+    def __hash__(self) -> int:
+        return hash((self.amount, self.currency))
+
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, Money):
             return NotImplemented
@@ -51,5 +77,6 @@ class Money:
         return self.amount < other.amount
 
     @classmethod
+    @cache  # Money is immutable, so a single zero per currency can be shared
     def zero(cls, currency: str = DEFAULT_CURRENCY) -> Money:
-        return cls("0.00", currency)
+        return cls._from_quantized(ZERO_AMOUNT, currency)
@@ -0,0 +1,123 @@
+import threading
+import time
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Protocol, Self
+
+# Output layer that joins serialized lines into large writes, so small lines
+# on an unbuffered pipe do not cost one system call each. The policy decides
+# when the collected lines are written: after a number of characters, after a
+# number of lines, after some time or after every line, for interactive use.
+# The time is checked as lines are written and by a timer started with the
+# first buffered line, so output still goes out when the input goes quiet. Whatever the policy, no more than
+# max_buffered_chars are kept: --stream writes a long array in small pieces
+# without newlines, and counting lines alone would buffer all of it.
+
+MAX_BUFFERED_CHARS = 1024 * 1024
+
+
+class TextSink(Protocol):
+    def write(self, text: str, /) -> int: ...
+
+    def flush(self) -> None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class FlushPolicy:
+    max_chars: int | None = None
+    max_lines: int | None = None
+    max_seconds: float | None = None
+
+
+FLUSH_POLICIES = {
+    "size": FlushPolicy(max_chars=1024 * 1024),
+    "lines": FlushPolicy(max_lines=4096),
+    "time": FlushPolicy(max_seconds=0.1),
+    "immediate": FlushPolicy(max_lines=1),
+}
+
+
+class BufferedLineWriter:
+    def __init__(
+        self,
+        writer: TextSink,
+        policy: FlushPolicy,
+        max_buffered_chars: int = MAX_BUFFERED_CHARS,
+    ) -> None:
+        self._writer = writer
+        self._policy = policy
+        self._max_chars = min(
+            policy.max_chars or max_buffered_chars, max_buffered_chars
+        )
+        self._buffer: list[str] = []
+        self._chars = 0
+        self._lines = 0
+        self._flushed_at = time.monotonic()
+        # the timer flushes from its own thread, so the buffer is shared
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._timer_error: OSError | None = None
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._raise_timer_error()
+            self._buffer.append(text)
+            self._chars += len(text)
+            self._lines += text.count("\n")
+            policy = self._policy
+            if (
+                self._chars >= self._max_chars
+                or (policy.max_lines is not None and self._lines >= policy.max_lines)
+                or (
+                    policy.max_seconds is not None
+                    and time.monotonic() - self._flushed_at >= policy.max_seconds
+                )
+            ):
+                self._flush()
+            elif policy.max_seconds is not None and self._timer is None:
+                self._timer = threading.Timer(policy.max_seconds, self._flush_on_time)
+                self._timer.daemon = True
+                self._timer.start()
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._raise_timer_error()
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            self._writer.write("".join(self._buffer))
+            self._buffer.clear()
+            self._chars = self._lines = 0
+        self._writer.flush()
+        self._flushed_at = time.monotonic()
+
+    def _flush_on_time(self) -> None:
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                return  # cancelled after it fired, the lines are already out
+            self._timer = None
+            try:
+                self._flush()
+            except OSError as error:  # e.g. a closed pipe, raised by the next call
+                self._timer_error = error
+
+    def _raise_timer_error(self) -> None:
+        if self._timer_error is not None:
+            error, self._timer_error = self._timer_error, None
+            raise error
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.flush()
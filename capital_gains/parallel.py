@@ -0,0 +1,78 @@
+import os
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from io import Writer
+from itertools import batched
+from typing import Literal, assert_never
+
+from .cli import process_line, readlines
+from .tax import Engine
+
+# Workers run process_line, which only touches immutable objects and
+# per-call locals, so it is safe from threads too. Threads only run in
+# parallel on a free-threaded build; interpreters (one GIL each) and
+# processes work everywhere, processes paying to pickle every chunk.
+type Backend = Literal["process", "thread", "interpreter"]
+
+DEFAULT_CHUNK_SIZE = 256  # lines per task sent to a worker
+
+
+def process_chunk(lines: tuple[str, ...], engine: Engine = "decimal") -> str:
+    # every line is an independent simulation, so a chunk can run anywhere;
+    # results travel back as a single string to keep IPC cost per chunk low
+    return "".join([process_line(line, engine) for line in lines])
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs < 0:
+        raise ValueError(f"Invalid number of jobs: {jobs}")
+    if jobs == 0:
+        return os.process_cpu_count() or 1
+    return jobs
+
+
+def make_executor(backend: Backend, workers: int) -> Executor:
+    match backend:
+        case "process":
+            return ProcessPoolExecutor(max_workers=workers)
+        case "thread":
+            return ThreadPoolExecutor(max_workers=workers)
+        case "interpreter":
+            # imported on demand, it brings in concurrent.interpreters
+            from concurrent.futures import InterpreterPoolExecutor
+
+            return InterpreterPoolExecutor(max_workers=workers)
+        case _ as unreachable:  # pragma: no cover
+            assert_never(unreachable)
+
+
+def process_operations_parallel(
+    reader_stream: Iterable[str],
+    writer_stream: Writer[str],
+    jobs: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: int | None = None,
+    engine: Engine = "decimal",
+    backend: Backend = "process",
+) -> None:
+    workers = resolve_jobs(jobs)
+    # backpressure: never keep more than max_pending chunks in flight,
+    # so memory is bounded regardless of the input size
+    pending_limit = max_pending or workers * 2
+    pending: deque[Future[str]] = deque()
+
+    with make_executor(backend, workers) as executor:
+        for chunk in batched(readlines(reader_stream), chunk_size):
+            if len(pending) >= pending_limit:
+                # futures are consumed in submission order to preserve input order
+                writer_stream.write(pending.popleft().result())
+            pending.append(executor.submit(process_chunk, chunk, engine))
+
+        while pending:
+            writer_stream.write(pending.popleft().result())
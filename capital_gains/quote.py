@@ -0,0 +1,127 @@
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from .cents import (
+    EXEMPTION_LIMIT_CENTS,
+    TAX_RATE_DENOMINATOR,
+    TAX_RATE_NUMERATOR,
+    divide_half_even,
+    from_cents,
+    money_to_cents,
+)
+from .money import Money
+from .tax import InvestmentState, Operation, OperationResult, handle_sell
+
+# What-if sells on an already computed state (for example the result of
+# calculate_final_states or the state store): one quote costs a single
+# handle_sell instead of replaying the history. Many quotes at once are
+# evaluated in integer cents, vectorized with NumPy when it is installed
+# (pip install capital-gains[vector]) and with a plain loop otherwise.
+
+INT64_MAX = 2**63 - 1
+
+
+def quote_sell(
+    state: InvestmentState, unit_cost: Money, quantity: int
+) -> OperationResult:
+    return handle_sell(state, Operation("sell", unit_cost, quantity))
+
+
+@dataclass(frozen=True, slots=True)
+class SellQuotes:
+    # one entry per quote, amounts in cents; NumPy arrays when available
+    taxes: Sequence[int]
+    accumulated_losses: Sequence[int]
+    quantities: Sequence[int]
+
+
+def quote_sells_python(
+    state: InvestmentState, unit_costs: Sequence[int], quantities: Sequence[int]
+) -> SellQuotes:
+    average = money_to_cents(state.weighted_average_price)
+    loss = money_to_cents(state.accumulated_loss)
+    taxes: list[int] = []
+    losses: list[int] = []
+    for unit_cost, quantity in zip(unit_costs, quantities, strict=True):
+        taxable_profit = (unit_cost - average) * quantity - loss
+        losses.append(-taxable_profit if taxable_profit < 0 else 0)
+        taxes.append(
+            divide_half_even(taxable_profit * TAX_RATE_NUMERATOR, TAX_RATE_DENOMINATOR)
+            if taxable_profit > 0 and unit_cost * quantity > EXEMPTION_LIMIT_CENTS
+            else 0
+        )
+    return SellQuotes(
+        taxes, losses, [state.quantity - quantity for quantity in quantities]
+    )
+
+
+def fits_int64(
+    state: InvestmentState, unit_costs: Sequence[int], quantities: Sequence[int]
+) -> bool:
+    # bound of the largest intermediate, taxable_profit * TAX_RATE_NUMERATOR
+    largest_cost = max(map(abs, unit_costs), default=0) + abs(
+        money_to_cents(state.weighted_average_price)
+    )
+    largest_quantity = max(map(abs, quantities), default=0)
+    loss = abs(money_to_cents(state.accumulated_loss))
+    return (
+        max(largest_cost * max(largest_quantity, 1) + loss, abs(state.quantity))
+        * TAX_RATE_NUMERATOR
+        <= INT64_MAX
+    )
+
+
+def quote_sells_cents(
+    state: InvestmentState, unit_costs: Sequence[int], quantities: Sequence[int]
+) -> SellQuotes:
+    try:
+        import numpy as np
+
+        from .scenarios import divide_half_even_lanes
+    except ImportError:
+        return quote_sells_python(state, unit_costs, quantities)
+    if not fits_int64(state, unit_costs, quantities):
+        # int64 would wrap silently; Python integers are exact at any size
+        return quote_sells_python(state, unit_costs, quantities)
+
+    unit_cost = np.asarray(unit_costs, dtype=np.int64)
+    quantity = np.asarray(quantities, dtype=np.int64)
+    if unit_cost.shape != quantity.shape:
+        raise ValueError("unit_costs and quantities must have the same length")
+    average = money_to_cents(state.weighted_average_price)
+    loss = money_to_cents(state.accumulated_loss)
+
+    taxable_profit = (unit_cost - average) * quantity - loss
+    taxable = (taxable_profit > 0) & (unit_cost * quantity > EXEMPTION_LIMIT_CENTS)
+    tax = divide_half_even_lanes(
+        taxable_profit * TAX_RATE_NUMERATOR, TAX_RATE_DENOMINATOR
+    )
+    return SellQuotes(
+        taxes=np.where(taxable, tax, 0),
+        accumulated_losses=np.maximum(-taxable_profit, 0),
+        quantities=state.quantity - quantity,
+    )
+
+
+def quote_sells(
+    state: InvestmentState, quotes: Iterable[tuple[Money, int]]
+) -> list[OperationResult]:
+    pairs = list(quotes)
+    result = quote_sells_cents(
+        state,
+        [money_to_cents(unit_cost) for unit_cost, _ in pairs],
+        [quantity for _, quantity in pairs],
+    )
+    return [
+        OperationResult(
+            new_state=InvestmentState(
+                quantity=int(quantity),
+                weighted_average_price=state.weighted_average_price,
+                accumulated_loss=from_cents(int(loss)),
+            ),
+            tax=from_cents(int(tax)),
+        )
+        for tax, loss, quantity in zip(
+            result.taxes, result.accumulated_losses, result.quantities, strict=True
+        )
+    ]
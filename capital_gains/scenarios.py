@@ -0,0 +1,186 @@
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import numpy.typing as npt
+
+from .cents import (
+    EXEMPTION_LIMIT_CENTS,
+    TAX_RATE_DENOMINATOR,
+    TAX_RATE_NUMERATOR,
+    CentsState,
+    money_to_cents,
+)
+from .parallel import resolve_jobs
+from .tax import INITIAL_INVESTMENT, InvestmentState, Operation
+
+# Monte Carlo scenario engine (requires the optional NumPy dependency). The
+# base operations are replayed once for all scenarios: every scenario is a
+# lane of an int64 array in cents, and its unit costs are the base unit costs
+# plus that scenario's row of shocks. Quantities do not depend on prices, so
+# they stay plain integers shared by every lane. Rounding follows the cents
+# engine, so each lane matches the scalar engines exactly.
+
+type Lanes = npt.NDArray[np.int64]
+type ScenarioStep = tuple[str, int, str | None]  # operation, quantity, ticker
+
+DEFAULT_LANES_PER_TASK = 4096
+# int64 lanes are used while every intermediate amount stays below this bound,
+# estimated in float64 with a margin for its rounding
+INT64_SAFE_BOUND = 2.0**62
+
+
+def divide_half_even_lanes(numerator: Lanes, denominator: int) -> Lanes:
+    # vectorized cents.divide_half_even; object lanes have no divmod ufunc
+    if numerator.dtype == object:
+        quotient = numerator // denominator
+        remainder = numerator - quotient * denominator
+    else:
+        quotient, remainder = np.divmod(numerator, denominator)
+    doubled_remainder = 2 * remainder
+    return quotient + (
+        (doubled_remainder > denominator)
+        | ((doubled_remainder == denominator) & (quotient % 2 == 1))
+    )
+
+
+def simulate_lanes(
+    steps: Sequence[ScenarioStep], unit_costs: Lanes, state: CentsState
+) -> Lanes:
+    # int64 lanes, or object lanes of Python integers when int64 could overflow
+    lanes = unit_costs.shape[0]
+    taxes = np.zeros(unit_costs.shape, dtype=unit_costs.dtype)
+    initial_quantity, initial_average, initial_loss = state
+    positions: dict[str | None, tuple[int, Lanes, Lanes]] = {}
+    for index, (operation, shares, ticker) in enumerate(steps):
+        if ticker in positions:
+            quantity, average, loss = positions[ticker]
+        else:
+            quantity = initial_quantity
+            average = np.full(lanes, initial_average, dtype=unit_costs.dtype)
+            loss = np.full(lanes, initial_loss, dtype=unit_costs.dtype)
+        unit_cost = unit_costs[:, index]
+        if operation == "buy":
+            new_quantity = quantity + shares
+            if new_quantity == 0:
+                raise ZeroDivisionError("Buy leaves the position without shares")
+            average = divide_half_even_lanes(
+                average * quantity + unit_cost * shares, new_quantity
+            )
+            quantity = new_quantity
+        elif operation == "sell":
+            taxable_profit = (unit_cost - average) * shares - loss
+            loss = np.maximum(-taxable_profit, 0)
+            quantity -= shares
+            taxable = (taxable_profit > 0) & (
+                unit_cost * shares > EXEMPTION_LIMIT_CENTS
+            )
+            taxes[:, index] = np.where(
+                taxable,
+                divide_half_even_lanes(
+                    taxable_profit * TAX_RATE_NUMERATOR, TAX_RATE_DENOMINATOR
+                ),
+                0,
+            )
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+        positions[ticker] = (quantity, average, loss)
+    return taxes
+
+
+def int64_lanes(
+    shocks: Lanes, base_costs: Lanes, steps: Sequence[ScenarioStep], state: CentsState
+) -> npt.NDArray[np.bool_]:
+    # Per lane, a bound of every intermediate amount of simulate_lanes: the
+    # average never exceeds the largest unit cost, and the accumulated loss
+    # grows by at most twice the largest unit cost per sold share.
+    initial_quantity, initial_average, initial_loss = state
+    largest_cost = np.maximum(
+        np.abs(shocks.astype(np.float64) + base_costs).max(axis=1, initial=0.0),
+        abs(initial_average),
+    )
+    positions: dict[str | None, int] = {}
+    largest_quantity = abs(initial_quantity)
+    sold = 0
+    for operation, shares, ticker in steps:
+        quantity = positions.get(ticker, initial_quantity)
+        if operation == "sell":
+            quantity -= shares
+            sold += shares
+        else:
+            quantity += shares
+        positions[ticker] = quantity
+        largest_quantity = max(largest_quantity, abs(quantity), shares)
+    bound = np.maximum(
+        largest_cost * largest_quantity, abs(initial_loss) + 4 * largest_cost * sold
+    )
+    return bound * TAX_RATE_NUMERATOR < INT64_SAFE_BOUND
+
+
+def simulate_blocks(
+    steps: Sequence[ScenarioStep],
+    unit_costs: Lanes,
+    state: CentsState,
+    jobs: int,
+    lanes_per_task: int,
+) -> Lanes:
+    workers = resolve_jobs(jobs)
+    if workers == 1 or len(unit_costs) <= lanes_per_task:
+        return simulate_lanes(steps, unit_costs, state)
+
+    # lanes are independent: split the scenarios into blocks of rows
+    blocks = [
+        unit_costs[start : start + lanes_per_task]
+        for start in range(0, len(unit_costs), lanes_per_task)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            simulate_lanes, [steps] * len(blocks), blocks, [state] * len(blocks)
+        )
+        return np.concatenate(list(results))
+
+
+def run_scenarios(
+    operations: Sequence[Operation],
+    shocks: npt.ArrayLike,
+    initial_state: InvestmentState = INITIAL_INVESTMENT,
+    jobs: int = 1,
+    lanes_per_task: int = DEFAULT_LANES_PER_TASK,
+) -> Lanes:
+    # shocks[s, i] is added, in cents, to the unit cost of operation i in
+    # scenario s; returns the tax in cents of every operation in every scenario
+    shock_matrix = np.asarray(shocks, dtype=np.int64)
+    if shock_matrix.ndim != 2 or shock_matrix.shape[1] != len(operations):
+        raise ValueError("shocks must have one column per operation")
+    base_costs = np.array(
+        [money_to_cents(operation.unit_cost) for operation in operations],
+        dtype=np.int64,
+    )
+    steps = [
+        (operation.operation, operation.quantity, operation.ticker)
+        for operation in operations
+    ]
+    state = (
+        initial_state.quantity,
+        money_to_cents(initial_state.weighted_average_price),
+        money_to_cents(initial_state.accumulated_loss),
+    )
+
+    exact = int64_lanes(shock_matrix, base_costs, steps, state)
+    if exact.all():
+        return simulate_blocks(
+            steps, shock_matrix + base_costs, state, jobs, lanes_per_task
+        )
+
+    # lanes that could overflow int64 are simulated with Python integers, and
+    # the result holds Python integers (dtype object) for every lane
+    taxes = np.empty(shock_matrix.shape, dtype=object)
+    taxes[exact] = simulate_blocks(
+        steps, shock_matrix[exact] + base_costs, state, jobs, lanes_per_task
+    )
+    taxes[~exact] = simulate_lanes(
+        steps,
+        shock_matrix[~exact].astype(object) + base_costs.astype(object),
+        state,
+    )
+    return taxes
@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import json
+from collections.abc import Sequence
+from contextlib import suppress
+
+from .cli import process_line
+from .endpoint import DEFAULT_HOST, DEFAULT_PORT
+from .tax import ENGINES, Engine
+
+# Long-running server that answers newline-delimited operation arrays with the
+# same lines the CLI prints, removing interpreter startup from every request.
+# Requests from every client are gathered for a short batch window and each
+# batch is processed in one executor call, so the event loop keeps reading and
+# writing for other clients meanwhile; each connection gets its replies in
+# request order.
+
+DEFAULT_BATCH_WINDOW = 0.002  # seconds
+DEFAULT_MAX_BATCH = 256  # lines
+DEFAULT_LINE_LIMIT = 64 * 1024 * 1024  # bytes, asyncio's default is 64 KiB
+
+type Request = tuple[str, asyncio.Future[str]]
+
+
+def format_error(error: Exception) -> str:
+    return json.dumps({"error": f"{type(error).__name__}: {error}"}) + "\n"
+
+
+def process_batch(lines: list[str], engine: Engine) -> list[str]:
+    replies = []
+    for line in lines:
+        try:
+            replies.append(process_line(line, engine))
+        except Exception as error:
+            # a bad line must not take the server down
+            replies.append(format_error(error))
+    return replies
+
+
+class TaxServer:
+    def __init__(
+        self,
+        engine: Engine = "decimal",
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        self.engine = engine
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._requests: asyncio.Queue[Request] = asyncio.Queue()
+        self._batcher: asyncio.Task[None] | None = None
+
+    async def _next_batch(self) -> list[Request]:
+        batch = [await self._requests.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._requests.get(), timeout))
+            except TimeoutError:
+                break
+        return batch
+
+    async def process_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # skip the replies of clients that went away
+            batch = [
+                request
+                for request in await self._next_batch()
+                if not request[1].cancelled()
+            ]
+            if not batch:
+                continue
+            lines = [line for line, _ in batch]
+            results = await loop.run_in_executor(
+                None, process_batch, lines, self.engine
+            )
+            for (_, reply), result in zip(batch, results, strict=True):
+                if not reply.cancelled():
+                    reply.set_result(result)
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        replies: asyncio.Queue[asyncio.Future[str] | None] = asyncio.Queue()
+
+        async def send_replies() -> None:
+            while (reply := await replies.get()) is not None:
+                writer.write((await reply).encode())
+                await writer.drain()
+
+        sender = asyncio.create_task(send_replies())
+        try:
+            async for raw_line in reader:
+                line = raw_line.decode()
+                if not line.strip():
+                    continue
+                reply: asyncio.Future[str] = loop.create_future()
+                await self._requests.put((line, reply))
+                await replies.put(reply)
+            await replies.put(None)
+            await sender
+        finally:
+            sender.cancel()
+            writer.close()
+            await writer.wait_closed()
+
+    async def serve(
+        self,
+        socket_path: str | None = None,
+        host: str = DEFAULT_HOST,
+        port: int = 0,
+        line_limit: int = DEFAULT_LINE_LIMIT,
+    ) -> asyncio.Server:
+        if self._batcher is None:
+            self._batcher = asyncio.create_task(self.process_batches())
+        if socket_path is not None:
+            return await asyncio.start_unix_server(
+                self.handle_client, path=socket_path, limit=line_limit
+            )
+        return await asyncio.start_server(
+            self.handle_client, host=host, port=port, limit=line_limit
+        )
+
+    async def close(self) -> None:
+        if self._batcher is not None:
+            self._batcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._batcher
+            self._batcher = None
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="capital-gains-server",
+        description="Serve tax calculations over a Unix socket or localhost TCP.",
+    )
+    parser.add_argument("--socket", help="Unix domain socket path")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--engine", choices=ENGINES, default="decimal")
+    parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=DEFAULT_BATCH_WINDOW * 1000,
+        help="milliseconds to wait for more lines before processing a batch",
+    )
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = TaxServer(args.engine, args.batch_window / 1000, args.max_batch)
+    listener = await server.serve(args.socket, args.host, args.port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    try:
+        asyncio.run(run(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,127 @@
+import json
+import zlib
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import Writer
+from itertools import batched
+from typing import TYPE_CHECKING, Literal
+
+from .cents import calculate_taxes_cents, parse_cents
+from .cli import readlines
+from .encoder import encode_tax, encode_tax_cents
+from .money import Money
+from .parallel import DEFAULT_CHUNK_SIZE, resolve_jobs
+from .tax import Engine, Operation, calculate_taxes
+
+if TYPE_CHECKING:
+    from .cli import RawOperation
+
+# Sharded mode: operations are split by ticker, hashed with crc32, so a single
+# line with many tickers is spread across worker processes. Tickers never
+# share state, so each shard is calculated on its own and the taxes are put
+# back in their original positions.
+
+# operation, unit cost as text, quantity, ticker
+type ShardOperation = tuple[Literal["sell", "buy"], str, int, str | None]
+type LineLayout = list[list[int]]  # positions of each shard's operations
+
+
+def shard_of(ticker: str | None, shards: int) -> int:
+    if ticker is None:
+        return 0
+    return zlib.crc32(ticker.encode()) % shards
+
+
+def split_line(line: str, shards: int) -> tuple[LineLayout, list[list[ShardOperation]]]:
+    raw_ops_list: list[RawOperation] = json.loads(line)
+    layout: LineLayout = [[] for _ in range(shards)]
+    operations: list[list[ShardOperation]] = [[] for _ in range(shards)]
+    for position, raw in enumerate(raw_ops_list):
+        ticker = raw.get("ticker")
+        shard = shard_of(ticker, shards)
+        layout[shard].append(position)
+        operations[shard].append(
+            (raw["operation"], str(raw["unit-cost"]), raw["quantity"], ticker)
+        )
+    return layout, operations
+
+
+def calculate_shard(
+    lines: list[list[ShardOperation]], engine: Engine = "decimal"
+) -> list[list[str]]:
+    # runs in a worker; returns the encoded taxes of every line of the shard
+    if engine == "cents":
+        return [
+            [
+                encode_tax_cents(tax)
+                for tax in calculate_taxes_cents(
+                    (operation, parse_cents(unit_cost), quantity, ticker)
+                    for operation, unit_cost, quantity, ticker in operations
+                )
+            ]
+            for operations in lines
+        ]
+    return [
+        [
+            encode_tax(tax)
+            for tax in calculate_taxes(
+                Operation(operation, Money(unit_cost), quantity, ticker)
+                for operation, unit_cost, quantity, ticker in operations
+            )
+        ]
+        for operations in lines
+    ]
+
+
+def merge_chunk(layouts: list[LineLayout], shard_results: list[list[list[str]]]) -> str:
+    output: list[str] = []
+    for line_index, layout in enumerate(layouts):
+        taxes = [""] * sum(map(len, layout))
+        for positions, results in zip(layout, shard_results, strict=True):
+            for position, tax in zip(positions, results[line_index], strict=True):
+                taxes[position] = tax
+        output.append("[" + ", ".join(taxes) + "]\n")
+    return "".join(output)
+
+
+def process_operations_sharded(
+    reader_stream: Iterable[str],
+    writer_stream: Writer[str],
+    shards: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    engine: Engine = "decimal",
+) -> None:
+    shards = resolve_jobs(shards)
+    pending_limit = shards * 2
+    pending: deque[tuple[list[LineLayout], list[Future[list[list[str]]]]]] = deque()
+
+    def write_oldest() -> None:
+        layouts, futures = pending.popleft()
+        writer_stream.write(
+            merge_chunk(layouts, [future.result() for future in futures])
+        )
+
+    with ProcessPoolExecutor(max_workers=shards) as executor:
+        for chunk in batched(readlines(reader_stream), chunk_size):
+            layouts: list[LineLayout] = []
+            shard_lines: list[list[list[ShardOperation]]] = [[] for _ in range(shards)]
+            for line in chunk:
+                layout, operations = split_line(line, shards)
+                layouts.append(layout)
+                for shard, shard_operations in enumerate(operations):
+                    shard_lines[shard].append(shard_operations)
+            if len(pending) >= pending_limit:
+                write_oldest()
+            pending.append(
+                (
+                    layouts,
+                    [
+                        executor.submit(calculate_shard, lines, engine)
+                        for lines in shard_lines
+                    ],
+                )
+            )
+
+        while pending:
+            write_oldest()
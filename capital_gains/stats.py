@@ -0,0 +1,89 @@
+import json
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from io import Writer
+
+from .cents import calculate_taxes_cents
+from .cli import parse_json_line, parse_json_line_cents, readlines
+from .encoder import encode_taxes, encode_taxes_cents
+from .tax import Engine, calculate_taxes
+
+STAGES = ("read", "parse", "calculate", "write")
+
+
+@dataclass(slots=True)
+class PipelineStats:
+    lines: int = 0
+    operations: int = 0
+    buys: int = 0
+    sells: int = 0
+    taxable_sells: int = 0
+    wall_seconds: float = 0.0
+    stage_seconds: dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(STAGES, 0.0)
+    )
+    slowest_line: int | None = None  # position among the non-empty lines
+    slowest_line_operations: int = 0
+    slowest_line_seconds: float = 0.0
+
+    def record_line(self, seconds: float, operations: int) -> None:
+        self.lines += 1
+        self.operations += operations
+        if seconds > self.slowest_line_seconds:
+            self.slowest_line = self.lines
+            self.slowest_line_operations = operations
+            self.slowest_line_seconds = seconds
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+def process_operations_with_stats(
+    reader_stream: Iterable[str],
+    writer_stream: Writer[str],
+    stats: PipelineStats,
+    engine: Engine = "decimal",
+) -> None:
+    # instrumented copy of cli.process_operations, used only with --stats so
+    # the regular loop does not pay for the clock calls
+    clock = time.perf_counter
+    stage_seconds = stats.stage_seconds
+    lines = readlines(reader_stream)
+    started = clock()
+    try:
+        while True:
+            line_started = clock()
+            line = next(lines, None)
+            parse_started = clock()
+            stage_seconds["read"] += parse_started - line_started
+            if line is None:
+                break
+
+            if engine == "cents":
+                cents_operations = parse_json_line_cents(line)
+                calculate_started = clock()
+                taxes_cents = calculate_taxes_cents(cents_operations)
+                write_started = clock()
+                writer_stream.write(encode_taxes_cents(taxes_cents) + "\n")
+                kinds = [operation for operation, _, _, _ in cents_operations]
+                taxable = sum(1 for tax in taxes_cents if tax > 0)
+            else:
+                operations = parse_json_line(line)
+                calculate_started = clock()
+                taxes = calculate_taxes(operations)
+                write_started = clock()
+                writer_stream.write(encode_taxes(taxes) + "\n")
+                kinds = [operation.operation for operation in operations]
+                taxable = sum(1 for tax in taxes if tax.amount > 0)
+            finished = clock()
+
+            stage_seconds["parse"] += calculate_started - parse_started
+            stage_seconds["calculate"] += write_started - calculate_started
+            stage_seconds["write"] += finished - write_started
+            stats.record_line(finished - line_started, len(kinds))
+            stats.buys += kinds.count("buy")
+            stats.sells += kinds.count("sell")
+            stats.taxable_sells += taxable
+    finally:
+        stats.wall_seconds = clock() - started
@@ -0,0 +1,96 @@
+import sqlite3
+from collections.abc import Iterable
+from decimal import Decimal
+from io import Writer
+from types import TracebackType
+from typing import Self
+
+from .cli import parse_json_line, readlines
+from .encoder import encode_results
+from .money import Money
+from .tax import INITIAL_INVESTMENT, Engine, InvestmentState, process_operations_batch
+
+# File-backed store with the last InvestmentState of each account, so appended
+# operations continue from where the previous run stopped instead of
+# resending the whole history: cost is O(new operations), not O(history).
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS account_state (
+    account TEXT PRIMARY KEY,
+    quantity INTEGER NOT NULL,
+    weighted_average_price TEXT NOT NULL,
+    accumulated_loss TEXT NOT NULL,
+    currency TEXT NOT NULL
+)
+"""
+
+
+class StateStore:
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def load(self, account: str) -> InvestmentState:
+        row = self.connection.execute(
+            "SELECT quantity, weighted_average_price, accumulated_loss, currency"
+            " FROM account_state WHERE account = ?",
+            (account,),
+        ).fetchone()
+        if row is None:
+            return INITIAL_INVESTMENT
+        quantity, average, loss, currency = row
+        return InvestmentState(
+            quantity=quantity,
+            weighted_average_price=Money(Decimal(average), currency),
+            accumulated_loss=Money(Decimal(loss), currency),
+        )
+
+    def save(self, account: str, state: InvestmentState) -> None:
+        # amounts are stored as text to keep them exact
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO account_state VALUES (?, ?, ?, ?, ?)",
+                (
+                    account,
+                    state.quantity,
+                    str(state.weighted_average_price.amount),
+                    str(state.accumulated_loss.amount),
+                    state.weighted_average_price.currency,
+                ),
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def process_account_operations(
+    reader_stream: Iterable[str],
+    writer_stream: Writer[str],
+    store: StateStore,
+    account: str,
+    engine: Engine = "decimal",
+) -> None:
+    # every line continues the account's history instead of starting over
+    state = store.load(account)
+    for line in readlines(reader_stream):
+        operations = parse_json_line(line)
+        if any(operation.ticker is not None for operation in operations):
+            # the store keeps a single position per account
+            raise ValueError("Operations with a ticker are not supported here")
+        results = process_operations_batch(operations, state, engine)
+        writer_stream.write(encode_results(results) + "\n")
+        if results:
+            state = results[-1].new_state
+            store.save(account, state)
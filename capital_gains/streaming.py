@@ -0,0 +1,106 @@
+import json
+from collections.abc import Iterator
+from io import Reader, Writer
+
+from .cli import parse_raw_operation
+from .encoder import encode_tax
+from .tax import Operation, iter_taxes
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .cli import RawOperation
+
+DEFAULT_READ_SIZE = 64 * 1024  # characters read from the input at a time
+MAX_ELEMENT_SIZE = 1024 * 1024  # a single operation is never this large
+WHITESPACE = " \t\n\r"
+
+
+# Tokenizes a stream of JSON operation arrays one element at a time.
+# Only the current element is kept in memory, so arbitrarily long arrays
+# (or lines) are read with a bounded buffer.
+class OperationArrayReader:
+    def __init__(self, reader: Reader[str], read_size: int = DEFAULT_READ_SIZE) -> None:
+        self._reader = reader
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._reader.read(self._read_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # drop what was already consumed before growing the buffer
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._position < len(self._buffer):
+                char = self._buffer[self._position]
+                if char not in WHITESPACE:
+                    return char
+                self._position += 1
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected: str) -> str:
+        char = self._peek()
+        if char not in expected:
+            found = repr(char) if char else "end of input"
+            raise ValueError(f"Expected one of {expected!r}, found {found}")
+        self._position += 1
+        return char
+
+    def _decode_element(self) -> RawOperation:
+        self._peek()  # raw_decode does not skip leading whitespace
+        while True:
+            try:
+                raw, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # the element may be split across reads; give up at EOF or
+                # when the pending text can no longer be a single operation
+                pending = len(self._buffer) - self._position
+                if pending > MAX_ELEMENT_SIZE or not self._fill():
+                    raise
+                continue
+            if end == len(self._buffer) and self._fill():
+                # a number could continue in the next read, decode it again
+                continue
+            self._position = end
+            return raw
+
+    def next_array(self) -> Iterator[Operation] | None:
+        if not self._peek():
+            return None
+        self._expect("[")
+        return self._elements()
+
+    def _elements(self) -> Iterator[Operation]:
+        if self._peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield parse_raw_operation(self._decode_element())
+            if self._expect(",]") == "]":
+                return
+
+
+def process_operations_streaming(
+    reader_stream: Reader[str],
+    writer_stream: Writer[str],
+    read_size: int = DEFAULT_READ_SIZE,
+) -> None:
+    arrays = OperationArrayReader(reader_stream, read_size)
+    while (operations := arrays.next_array()) is not None:
+        separator = "["
+        for tax in iter_taxes(operations):
+            writer_stream.write(separator)
+            writer_stream.write(encode_tax(tax))
+            separator = ", "
+        writer_stream.write("[]\n" if separator == "[" else "]\n")
@@ -1,32 +1,72 @@
-from collections.abc import Iterable
-from dataclasses import dataclass, field
+from collections.abc import Generator, Iterable, Iterator
 from decimal import Decimal
-from typing import Literal, assert_never
+from itertools import chain
 
-from capital_gains.money import Money
+from capital_gains.frozen import frozen
+from capital_gains.money import DEFAULT_CURRENCY, TWOPLACES, Money
+
+# typing is only needed by the type checker and on unreachable branches, so it
+# stays out of the CLI startup imports
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Literal
+
+type Engine = Literal["decimal", "cents"]
+
+ENGINES: tuple[Engine, ...] = ("decimal", "cents")  # Engine, usable at runtime
 
 TAX_RATE = Decimal("0.20")  # 20%
 EXEMPTION_LIMIT = Money("20000.00")  # R$ 20.000,00
 
 
-@dataclass(frozen=True)
+@frozen
 class InvestmentState:
-    quantity: int = 0
-    weighted_average_price: Money = field(default_factory=Money.zero)
-    accumulated_loss: Money = field(default_factory=Money.zero)
+    __slots__ = ("quantity", "weighted_average_price", "accumulated_loss")
+    quantity: int
+    weighted_average_price: Money
+    accumulated_loss: Money
+
+    def __init__(
+        self,
+        quantity: int = 0,
+        weighted_average_price: Money = Money.zero(),
+        accumulated_loss: Money = Money.zero(),
+    ) -> None:
+        object.__setattr__(self, "quantity", quantity)
+        object.__setattr__(self, "weighted_average_price", weighted_average_price)
+        object.__setattr__(self, "accumulated_loss", accumulated_loss)
 
 
-@dataclass(frozen=True)
+@frozen
 class OperationResult:
+    __slots__ = ("new_state", "tax")
     new_state: InvestmentState
     tax: Money
 
+    def __init__(self, new_state: InvestmentState, tax: Money) -> None:
+        object.__setattr__(self, "new_state", new_state)
+        object.__setattr__(self, "tax", tax)
+
 
-@dataclass(frozen=True)
+@frozen
 class Operation:
+    __slots__ = ("operation", "unit_cost", "quantity", "ticker")
     operation: Literal["sell", "buy"]
     unit_cost: Money
     quantity: int
+    ticker: str | None
+
+    def __init__(
+        self,
+        operation: Literal["sell", "buy"],
+        unit_cost: Money,
+        quantity: int,
+        ticker: str | None = None,
+    ) -> None:
+        object.__setattr__(self, "operation", operation)
+        object.__setattr__(self, "unit_cost", unit_cost)
+        object.__setattr__(self, "quantity", quantity)
+        object.__setattr__(self, "ticker", ticker)
 
 
 def handle_buy(state: InvestmentState, operation: Operation) -> OperationResult:
@@ -83,19 +123,129 @@ def process_operation(state: InvestmentState, operation: Operation) -> Operation
         case "sell":
             return handle_sell(state, operation)
         case _ as unreachable:  # pragma: no cover
+            from typing import assert_never
+
             assert_never(unreachable)
 
 
 INITIAL_INVESTMENT = InvestmentState()
 
 
-def process_operations_batch(
+def iter_operation_results(
     operations: Iterable[Operation], initial_state: InvestmentState = INITIAL_INVESTMENT
-) -> list[OperationResult]:
+) -> Iterator[OperationResult]:
+    # every ticker has its own position, starting from initial_state
     current_state = initial_state
-    taxes: list[OperationResult] = []
+    ticker: str | None = None
+    parked: dict[str | None, InvestmentState] = {}
     for operation in operations:
+        if operation.ticker != ticker:
+            parked[ticker] = current_state
+            ticker = operation.ticker
+            current_state = parked.pop(ticker, initial_state)
         result = process_operation(current_state, operation)
-        taxes.append(result)
+        yield result
         current_state = result.new_state
-    return taxes
+
+
+def iter_taxes(
+    operations: Iterable[Operation], initial_state: InvestmentState = INITIAL_INVESTMENT
+) -> Generator[Money, None, dict[str | None, InvestmentState]]:
+    # Same rules as handle_buy and handle_sell, but the state lives in local
+    # variables and only the taxes are allocated; the final state of every
+    # ticker is the generator's return value. Money rounds after every
+    # operation; only division and the tax rate can produce more than two
+    # decimal places, so those are the only places that need quantize.
+    quantity = initial_state.quantity
+    average = initial_state.weighted_average_price.amount
+    loss = initial_state.accumulated_loss.amount
+    initial = (quantity, average, loss)
+    operations = iter(operations)
+    first = next(operations, None)
+    if first is None:
+        return {}
+    ticker = first.ticker
+    parked: dict[str | None, tuple[int, Decimal, Decimal]] = {}
+    zero_amount = Money.zero().amount
+    zero_tax = Money.zero()
+    exemption_limit = EXEMPTION_LIMIT.amount
+    for operation in chain((first,), operations):
+        if operation.unit_cost.currency != DEFAULT_CURRENCY:
+            raise ValueError(f"Unsupported currency: {operation.unit_cost.currency}")
+        if operation.ticker != ticker:
+            # park the current ticker's position and resume the next one;
+            # runs of the same ticker never get here. Parked entries are
+            # updated in place, so the final states keep the order in which
+            # the tickers first appear
+            parked[ticker] = (quantity, average, loss)
+            ticker = operation.ticker
+            quantity, average, loss = parked.get(ticker, initial)
+        unit_cost = operation.unit_cost.amount
+        shares = operation.quantity
+        match operation.operation:
+            case "buy":
+                new_quantity = quantity + shares
+                average = (
+                    (average * quantity + unit_cost * shares) / new_quantity
+                ).quantize(TWOPLACES)
+                quantity = new_quantity
+                yield zero_tax
+            case "sell":
+                taxable_profit = (unit_cost - average) * shares - loss
+                loss = -taxable_profit if taxable_profit < 0 else zero_amount
+                quantity -= shares
+                if taxable_profit > 0 and unit_cost * shares > exemption_limit:
+                    yield Money(taxable_profit * TAX_RATE)
+                else:
+                    yield zero_tax
+            case _ as unreachable:  # pragma: no cover
+                from typing import assert_never
+
+                assert_never(unreachable)
+    parked[ticker] = (quantity, average, loss)
+    currency = initial_state.weighted_average_price.currency
+    return {
+        key: InvestmentState(
+            quantity=position_quantity,
+            weighted_average_price=Money._from_quantized(position_average, currency),
+            accumulated_loss=Money._from_quantized(position_loss, currency),
+        )
+        for key, (position_quantity, position_average, position_loss) in parked.items()
+    }
+
+
+def calculate_taxes(
+    operations: Iterable[Operation], initial_state: InvestmentState = INITIAL_INVESTMENT
+) -> list[Money]:
+    return list(iter_taxes(operations, initial_state))
+
+
+def calculate_final_states(
+    operations: Iterable[Operation], initial_state: InvestmentState = INITIAL_INVESTMENT
+) -> dict[str | None, InvestmentState]:
+    # only the position of every ticker at the end is kept, taxes are dropped
+    taxes = iter_taxes(operations, initial_state)
+    while True:
+        try:
+            next(taxes)
+        except StopIteration as finished:
+            return finished.value
+
+
+def process_operations_batch(
+    operations: Iterable[Operation],
+    initial_state: InvestmentState = INITIAL_INVESTMENT,
+    engine: Engine = "decimal",
+) -> list[OperationResult]:
+    match engine:
+        case "decimal":
+            return list(iter_operation_results(operations, initial_state))
+        case "cents":
+            # imported here because the cents engine is built on this module
+            from capital_gains.cents import process_operations_batch_cents
+
+            return process_operations_batch_cents(operations, initial_state)
+        case _ as unreachable:  # pragma: no cover
+            from typing import assert_never
+
+            assert_never(unreachable)
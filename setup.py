@@ -0,0 +1,17 @@
+import os
+
+from setuptools import setup
+
+# The project metadata lives in pyproject.toml. With CAPITAL_GAINS_MYPYC=1 the
+# hot modules are compiled to C extensions with mypyc; the .py sources are
+# still installed, so a build without a compiler (or without the variable)
+# runs the same code as pure Python.
+COMPILED_MODULES = ["capital_gains/money.py", "capital_gains/tax.py"]
+
+ext_modules = []
+if os.environ.get("CAPITAL_GAINS_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(COMPILED_MODULES, opt_level="3")
+
+setup(ext_modules=ext_modules)
@@ -0,0 +1,244 @@
+import argparse
+import json
+import random
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+
+from capital_gains.engines import ENGINES, REFERENCE_ENGINE, TaxEngine
+from capital_gains.money import Money
+from capital_gains.parallel import resolve_jobs
+from capital_gains.tax import EXEMPTION_LIMIT, InvestmentState, Operation
+
+# Differential fuzzing: random valid operation sequences are run through every
+# registered engine and compared with the reference to the cent. A mismatch is
+# shrunk to a minimal reproducer, printed as an input line for the CLI.
+#
+#   uv run python -m tests.differential --cases 1000000 --jobs 0
+
+# quantities that divide the exemption limit, to land exactly on it
+EXEMPTION_QUANTITIES = [1, 2, 4, 5, 8, 10, 16, 20, 25, 40, 50, 80, 100, 125, 200]
+# quantities that make weighted averages need rounding
+ROUNDING_QUANTITIES = [3, 6, 7, 9, 11, 13, 33, 77, 333, 999, 1001]
+TICKERS = [None, None, None, "A", "B"]
+
+
+@dataclass(frozen=True, slots=True)
+class Mismatch:
+    engine: str
+    operations: list[Operation]
+    initial_state: InvestmentState
+    expected: list[Money] | str
+    actual: list[Money] | str
+
+
+def random_price(rng: random.Random) -> Money:
+    return Money(Decimal(rng.randint(1, 10_000)).scaleb(-2))
+
+
+def generate_operation(
+    rng: random.Random, held: dict[str | None, int], average: Money
+) -> Operation:
+    ticker = rng.choice(TICKERS)
+    quantity_held = held.get(ticker, 0)
+    roll = rng.random()
+    if quantity_held and roll < 0.5:
+        if rng.random() < 0.25:
+            # total operation value right at, or one cent around, the limit
+            quantity = rng.choice(
+                [q for q in EXEMPTION_QUANTITIES if q <= quantity_held] or [1]
+            )
+            unit_cost = Money(EXEMPTION_LIMIT.amount / quantity)
+            unit_cost += Money(rng.choice(["-0.01", "0.00", "0.00", "0.01"]))
+        else:
+            quantity = rng.randint(1, quantity_held)
+            # around the average price, to carry losses forward and use them
+            unit_cost = average + Money(Decimal(rng.randint(-500, 500)).scaleb(-2))
+            if unit_cost <= Money.zero():
+                unit_cost = random_price(rng)
+        operation = Operation("sell", unit_cost, quantity, ticker)
+        held[ticker] = quantity_held - quantity
+        return operation
+    if roll < 0.75:
+        quantity = rng.choice(ROUNDING_QUANTITIES)
+    else:
+        quantity = rng.randint(1, 100_000)
+    held[ticker] = quantity_held + quantity
+    return Operation("buy", random_price(rng), quantity, ticker)
+
+
+def generate_case(
+    rng: random.Random, max_operations: int
+) -> tuple[list[Operation], InvestmentState]:
+    initial_state = InvestmentState()
+    if rng.random() < 0.2:
+        # resume from a state with a loss to carry forward
+        initial_state = InvestmentState(
+            quantity=rng.randint(1, 1000),
+            weighted_average_price=random_price(rng),
+            accumulated_loss=random_price(rng) * rng.randint(1, 1000),
+        )
+    # every ticker starts from the initial state
+    held = dict.fromkeys(TICKERS, initial_state.quantity)
+    average = initial_state.weighted_average_price
+    operations: list[Operation] = []
+    for _ in range(rng.randint(1, max_operations)):
+        operation = generate_operation(rng, held, average)
+        if operation.operation == "buy":
+            average = operation.unit_cost
+        operations.append(operation)
+    return operations, initial_state
+
+
+def run_engine(
+    engine: TaxEngine, operations: Sequence[Operation], initial_state: InvestmentState
+) -> list[Money] | str:
+    try:
+        return engine(operations, initial_state)
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+
+
+def find_mismatch(
+    operations: list[Operation], initial_state: InvestmentState
+) -> Mismatch | None:
+    expected = run_engine(ENGINES[REFERENCE_ENGINE], operations, initial_state)
+    for name, engine in ENGINES.items():
+        if name == REFERENCE_ENGINE:
+            continue
+        actual = run_engine(engine, operations, initial_state)
+        if actual != expected:
+            return Mismatch(name, operations, initial_state, expected, actual)
+    return None
+
+
+def still_fails(
+    engine: str, operations: list[Operation], state: InvestmentState
+) -> bool:
+    expected = run_engine(ENGINES[REFERENCE_ENGINE], operations, state)
+    return run_engine(ENGINES[engine], operations, state) != expected
+
+
+def simpler_operations(operation: Operation) -> list[Operation]:
+    candidates = []
+    for quantity in {1, operation.quantity // 2}:
+        if 0 < quantity < operation.quantity:
+            candidates.append(
+                Operation(operation.operation, operation.unit_cost, quantity)
+            )
+    rounded = Money(operation.unit_cost.amount.to_integral_value())
+    if rounded != operation.unit_cost and rounded > Money.zero():
+        candidates.append(Operation(operation.operation, rounded, operation.quantity))
+    if operation.ticker is not None:
+        candidates.append(
+            Operation(operation.operation, operation.unit_cost, operation.quantity)
+        )
+    return candidates
+
+
+def shrink(mismatch: Mismatch) -> Mismatch:
+    engine, state = mismatch.engine, mismatch.initial_state
+    operations = list(mismatch.operations)
+    if still_fails(engine, operations, InvestmentState()):
+        state = InvestmentState()
+    # drop chunks of operations, from half of the sequence down to one
+    chunk = len(operations) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(operations):
+            candidate = operations[:start] + operations[start + chunk :]
+            if candidate and still_fails(engine, candidate, state):
+                operations = candidate
+            else:
+                start += chunk
+        chunk //= 2
+    # then make the remaining operations simpler, one at a time
+    changed = True
+    while changed:
+        changed = False
+        for index, operation in enumerate(operations):
+            for simpler in simpler_operations(operation):
+                candidate = [*operations[:index], simpler, *operations[index + 1 :]]
+                if still_fails(engine, candidate, state):
+                    operations = candidate
+                    changed = True
+                    break
+    expected = run_engine(ENGINES[REFERENCE_ENGINE], operations, state)
+    actual = run_engine(ENGINES[engine], operations, state)
+    return Mismatch(engine, operations, state, expected, actual)
+
+
+def format_operations(operations: Sequence[Operation]) -> str:
+    return json.dumps(
+        [
+            {
+                "operation": operation.operation,
+                "unit-cost": float(operation.unit_cost.amount),
+                "quantity": operation.quantity,
+            }
+            | ({} if operation.ticker is None else {"ticker": operation.ticker})
+            for operation in operations
+        ]
+    )
+
+
+def fuzz(cases: int, seed: int, max_operations: int) -> Mismatch | None:
+    rng = random.Random(seed)  # noqa: S311
+    for _ in range(cases):
+        mismatch = find_mismatch(*generate_case(rng, max_operations))
+        if mismatch is not None:
+            return shrink(mismatch)
+    return None
+
+
+def fuzz_parallel(
+    cases: int, seed: int, max_operations: int, jobs: int
+) -> Mismatch | None:
+    # every worker fuzzes its share of the cases with its own seed
+    workers = resolve_jobs(jobs)
+    shares = [
+        cases // workers + (worker < cases % workers) for worker in range(workers)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for mismatch in executor.map(
+            fuzz,
+            shares,
+            [seed * workers + worker for worker in range(workers)],
+            [max_operations] * workers,
+        ):
+            if mismatch is not None:
+                return mismatch
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare every registered engine with the reference engine."
+    )
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-operations", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    mismatch = fuzz_parallel(args.cases, args.seed, args.max_operations, args.jobs)
+    elapsed = time.perf_counter() - started
+    if mismatch is None:
+        print(
+            f"{args.cases:,} cases, engines {', '.join(ENGINES)}: no mismatch"
+            f" ({args.cases / elapsed:,.0f} cases/s)"
+        )
+        return
+    print(f"engine {mismatch.engine} differs from {REFERENCE_ENGINE}")
+    print(f"initial state: {mismatch.initial_state}")
+    print(f"input: {format_operations(mismatch.operations)}")
+    print(f"expected: {mismatch.expected}")
+    print(f"actual: {mismatch.actual}")
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from capital_gains import audit
+from capital_gains.__main__ import main
+from capital_gains.audit import iter_audit_records, process_operations_detailed
+from capital_gains.cli import parse_json_line, process_operations
+from capital_gains.money import Money
+from capital_gains.tax import process_operations_batch
+
+INPUT_DATA = (
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":5.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 3000}]\n'
+    "\n"
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 100, "ticker": "A"},'
+    ' {"operation":"buy", "unit-cost":20.00, "quantity": 10, "ticker": "B"},'
+    ' {"operation":"sell", "unit-cost":15.00, "quantity": 50, "ticker": "A"}]\n'
+)
+
+
+def state_tickers(states: str) -> list[str | None]:
+    return [json.loads(state)["ticker"] for state in states.splitlines()]
+
+
+def test_audit_records_explain_each_sell() -> None:
+    operations = parse_json_line(INPUT_DATA.splitlines()[0])
+
+    buy, loss_sell, taxed_sell = iter_audit_records(operations)
+
+    assert buy.gross_profit is None
+    assert buy.total_operation_value == Money("100000.00")
+    assert loss_sell.gross_profit == Money("-25000.00")
+    assert loss_sell.loss_deducted == Money.zero()
+    assert loss_sell.new_state.accumulated_loss == Money("25000.00")
+    assert taxed_sell.gross_profit == Money("30000.00")
+    assert taxed_sell.loss_deducted == Money("25000.00")
+    assert taxed_sell.taxable_profit == Money("5000.00")
+    assert taxed_sell.exempt is False
+    assert taxed_sell.tax == Money("1000.00")
+    assert [record.new_state for record in (buy, loss_sell, taxed_sell)] == [
+        result.new_state for result in process_operations_batch(operations)
+    ]
+
+
+def test_detail_sinks_receive_states_and_audit_records() -> None:
+    expected = io.StringIO()
+    process_operations(io.StringIO(INPUT_DATA), expected)
+    writer_stream, state_sink, audit_sink = io.StringIO(), io.StringIO(), io.StringIO()
+
+    process_operations_detailed(
+        io.StringIO(INPUT_DATA), writer_stream, state_sink, audit_sink
+    )
+
+    assert writer_stream.getvalue() == expected.getvalue()
+    states = [json.loads(line) for line in state_sink.getvalue().splitlines()]
+    assert [(state["line"], state["ticker"]) for state in states] == [
+        (1, None),
+        (2, "A"),
+        (2, "B"),
+    ]
+    assert states[1]["quantity"] == 50
+    records = [json.loads(line) for line in audit_sink.getvalue().splitlines()]
+    assert [(record["line"], record["index"]) for record in records] == [
+        (1, 0),
+        (1, 1),
+        (1, 2),
+        (2, 0),
+        (2, 1),
+        (2, 2),
+    ]
+    assert records[2]["loss-deducted"] == 25000.0
+    assert records[2]["tax"] == 1000.0
+    assert records[5]["exempt"] is True
+
+
+def test_state_level_does_not_build_audit_records(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(*args: object) -> None:
+        raise AssertionError("audit records were built")
+
+    monkeypatch.setattr(audit, "audit_operation", fail)
+    state_sink = io.StringIO()
+
+    process_operations_detailed(io.StringIO(INPUT_DATA), io.StringIO(), state_sink)
+
+    assert state_tickers(state_sink.getvalue()) == [None, "A", "B"]
+
+
+def test_audit_level_writes_the_same_states() -> None:
+    state_only, with_audit = io.StringIO(), io.StringIO()
+
+    process_operations_detailed(io.StringIO(INPUT_DATA), io.StringIO(), state_only)
+    process_operations_detailed(
+        io.StringIO(INPUT_DATA), io.StringIO(), with_audit, io.StringIO()
+    )
+
+    assert state_tickers(with_audit.getvalue()) == [None, "A", "B"]
+    assert with_audit.getvalue() == state_only.getvalue()
+
+
+def test_main_writes_detail_files(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    state_file, audit_file = tmp_path / "state.jsonl", tmp_path / "audit.jsonl"
+    monkeypatch.setattr("sys.stdin", io.StringIO(INPUT_DATA))
+
+    main(["--state-file", str(state_file), "--audit-file", str(audit_file)])
+
+    assert capsys.readouterr().out.count("\n") == 2
+    assert len(state_file.read_text().splitlines()) == 3
+    assert len(audit_file.read_text().splitlines()) == 6
+
+
+def test_detail_files_require_the_decimal_engine() -> None:
+    with pytest.raises(SystemExit):
+        main(["--audit-file", "audit.jsonl", "--engine", "cents"])
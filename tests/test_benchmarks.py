@@ -0,0 +1,19 @@
+import importlib
+
+import pytest
+
+# The benchmarks are not run by the suite, so at least check that each one
+# still builds its argument parser (and with it, imports) on the current tree.
+
+BENCHMARK_ARGUMENTS = {
+    "benchmarks.compiled": [],
+    "benchmarks.micro": ["compare"],
+    "benchmarks.scaling": [],
+    "benchmarks.throughput": [],
+}
+
+
+@pytest.mark.parametrize("module", BENCHMARK_ARGUMENTS)
+def test_benchmark_parses_its_defaults(module: str) -> None:
+    benchmark = importlib.import_module(module)
+    assert benchmark.parse_args(BENCHMARK_ARGUMENTS[module]) is not None
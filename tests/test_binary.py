@@ -0,0 +1,102 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from capital_gains.__main__ import main
+from capital_gains.binary import (
+    MAGIC,
+    RECORD,
+    BinaryArchive,
+    convert_jsonl,
+    process_archive,
+)
+from capital_gains.cli import parse_json_line, process_operations
+from capital_gains.tax import Engine
+
+INPUT_LINES = [
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000}]\n',
+    "\n",  # Linha ignorada
+    '[{"operation":"buy", "unit-cost":10.125, "quantity": 100}]\n',
+    "[]\n",
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":5.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 3000}]\n',
+]
+
+
+def write_archive(path: Path) -> str:
+    with path.open("wb") as output:
+        assert convert_jsonl(INPUT_LINES, output) == 4
+    return str(path)
+
+
+def test_archive_has_fixed_width_records(tmp_path: Path) -> None:
+    path = write_archive(tmp_path / "ops.bin")
+
+    size = Path(path).stat().st_size
+    assert size == len(MAGIC) + RECORD.size * (4 + 6)
+
+
+def test_archive_lines_match_parsed_json(tmp_path: Path) -> None:
+    path = write_archive(tmp_path / "ops.bin")
+
+    with BinaryArchive(path) as archive:
+        lines = list(archive.iter_lines())
+        columns = [
+            [column.tolist() for column in line] for line in archive.iter_columns()
+        ]
+
+    assert lines == [parse_json_line(line) for line in INPUT_LINES if line.strip()]
+    assert columns[0] == [[0, 1], [1000, 2000], [10000, 5000]]
+    assert columns[2] == [[], [], []]
+
+
+@pytest.mark.parametrize("engine", ["decimal", "cents"])
+def test_replay_matches_json_processing(tmp_path: Path, engine: Engine) -> None:
+    path = write_archive(tmp_path / "ops.bin")
+    expected = io.StringIO()
+    process_operations(INPUT_LINES, expected, engine)
+    writer_stream = io.StringIO()
+
+    process_archive(path, writer_stream, engine)
+
+    assert writer_stream.getvalue() == expected.getvalue()
+
+
+def test_archive_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "ops.bin"
+    path.write_bytes(b"[{}]\n" * 10)
+    with pytest.raises(ValueError):
+        BinaryArchive(str(path))
+
+    path.write_bytes(MAGIC + RECORD.pack(2, 0, 5))
+    with BinaryArchive(str(path)) as archive, pytest.raises(ValueError):
+        list(archive.iter_columns())
+
+
+def test_error_while_holding_columns_is_not_replaced(tmp_path: Path) -> None:
+    path = write_archive(tmp_path / "ops.bin")
+
+    with pytest.raises(RuntimeError), BinaryArchive(path) as archive:
+        for codes, _, _ in archive.iter_columns():
+            raise RuntimeError(codes.tolist())
+
+
+def test_tickers_are_rejected_by_the_converter() -> None:
+    line = '[{"operation":"buy", "unit-cost":1.00, "quantity": 1, "ticker": "A"}]'
+    with pytest.raises(ValueError):
+        convert_jsonl([line], io.BytesIO())
+
+
+def test_main_reads_binary_archive(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = write_archive(tmp_path / "ops.bin")
+
+    main(["--binary", path])
+
+    expected = io.StringIO()
+    process_operations(INPUT_LINES, expected)
+    assert capsys.readouterr().out == expected.getvalue()
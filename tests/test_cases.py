@@ -1,7 +1,12 @@
 import pytest
 
 from capital_gains.money import Money
-from capital_gains.tax import Operation, process_operations_batch
+from capital_gains.tax import (
+    Engine,
+    Operation,
+    calculate_taxes,
+    process_operations_batch,
+)
 
 test_cases = [
     (
@@ -131,14 +136,26 @@ test_cases = [
 ]
 
 
+@pytest.mark.parametrize("engine", ["decimal", "cents"])
 @pytest.mark.parametrize("operations_batch, expected_taxes", test_cases)
 def test_process_operations_taxes(
-    operations_batch: list[Operation], expected_taxes: list[Money]
+    operations_batch: list[Operation], expected_taxes: list[Money], engine: Engine
 ) -> None:
     # act
-    results_list = process_operations_batch(operations_batch)
+    results_list = process_operations_batch(operations_batch, engine=engine)
     actual_taxes = [result.tax for result in results_list]
 
     # assert
     assert len(actual_taxes) == len(operations_batch)
     assert actual_taxes == expected_taxes
+
+
+@pytest.mark.parametrize("operations_batch, expected_taxes", test_cases)
+def test_calculate_taxes(
+    operations_batch: list[Operation], expected_taxes: list[Money]
+) -> None:
+    # act
+    actual_taxes = calculate_taxes(operations_batch)
+
+    # assert
+    assert actual_taxes == expected_taxes
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.cents import (
+    calculate_taxes_cents,
+    divide_half_even,
+    from_cents,
+    parse_cents,
+    process_operations_batch_cents,
+    to_cents,
+)
+from capital_gains.money import Money
+from capital_gains.tax import InvestmentState, Operation, process_operations_batch
+
+
+@pytest.mark.parametrize(
+    "numerator, denominator, expected",
+    [
+        (10, 4, 2),  # 2.5 rounds to even
+        (14, 4, 4),  # 3.5 rounds to even
+        (1001, 1000, 1),
+        (1999, 1000, 2),
+        (-10, 4, -2),
+        (-14, 4, -4),
+        (2, 3, 1),
+    ],
+)
+def test_divide_half_even_matches_decimal_rounding(
+    numerator: int, denominator: int, expected: int
+) -> None:
+    assert divide_half_even(numerator, denominator) == expected
+    assert Money(Decimal(numerator) / Decimal(denominator) / 100) == from_cents(
+        expected
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["10", "10.0", "15.5", "0.125", "0.135", "0.1251", "-2.005", "1e-05", "1.5e+20"],
+)
+def test_parse_cents_matches_money_rounding(text: str) -> None:
+    assert from_cents(parse_cents(text)) == Money(text)
+
+
+def test_to_cents_and_from_cents_round_trip() -> None:
+    assert to_cents(Decimal("123.45")) == 12345
+    assert from_cents(12345) == Money("123.45")
+
+
+def test_calculate_taxes_cents_rounds_weighted_average_like_money() -> None:
+    # weighted average is 1010.00 / 3 = 336.666..., rounded to 336.67
+    operations = [
+        ("buy", 1000, 1, None),
+        ("buy", 50000, 2, None),
+        ("sell", 1_000_000, 3, None),
+    ]
+
+    taxes = calculate_taxes_cents(operations)
+
+    assert taxes == [0, 0, 579800]
+
+
+def test_calculate_taxes_cents_rejects_unknown_operations() -> None:
+    with pytest.raises(ValueError):
+        calculate_taxes_cents([("hold", 1000, 1)])
+
+
+def test_cents_engine_matches_decimal_engine_states() -> None:
+    initial_state = InvestmentState(
+        quantity=3,
+        weighted_average_price=Money("10.01"),
+        accumulated_loss=Money("7.50"),
+    )
+    operations = [
+        Operation(operation="buy", unit_cost=Money("20.33"), quantity=7),
+        Operation(operation="sell", unit_cost=Money("5.00"), quantity=4),
+        Operation(operation="buy", unit_cost=Money("99.99"), quantity=1000),
+        Operation(operation="sell", unit_cost=Money("150.00"), quantity=1006),
+    ]
+
+    assert process_operations_batch_cents(
+        operations, initial_state
+    ) == process_operations_batch(operations, initial_state)
+
+
+def test_cents_engine_rejects_other_currencies() -> None:
+    operations = [
+        Operation(operation="buy", unit_cost=Money("1.00", "USD"), quantity=1)
+    ]
+
+    with pytest.raises(ValueError):
+        process_operations_batch_cents(operations)
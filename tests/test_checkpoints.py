@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from capital_gains.checkpoints import CheckpointedHistory
+from capital_gains.money import Money
+from capital_gains.tax import Operation, calculate_taxes
+
+
+def make_operations(count: int, seed: int = 7) -> list[Operation]:
+    rng = random.Random(seed)  # noqa: S311
+    operations: list[Operation] = []
+    quantity = 0
+    for _ in range(count):
+        price = Money(f"{rng.uniform(5, 50):.2f}")
+        if quantity and rng.random() < 0.5:
+            shares = rng.randint(1, quantity)
+            operations.append(Operation("sell", price, shares))
+            quantity -= shares
+        else:
+            shares = rng.randint(1, 5000)
+            operations.append(Operation("buy", price, shares))
+            quantity += shares
+    return operations
+
+
+def test_history_taxes_match_full_calculation() -> None:
+    operations = make_operations(300)
+
+    history = CheckpointedHistory(operations, interval=16)
+
+    assert history.taxes == calculate_taxes(operations)
+    assert history.positions == list(range(0, 300, 16))
+
+
+@pytest.mark.parametrize("index", [0, 1, 16, 150, 299])
+def test_amendments_match_full_replay(index: int) -> None:
+    operations = make_operations(300)
+    history = CheckpointedHistory(operations, interval=16)
+    replacement = Operation("buy", Money("12.34"), 10)
+
+    history.insert(index, replacement)
+    operations.insert(index, replacement)
+    assert history.taxes == calculate_taxes(operations)
+
+    history.edit(index, Operation("buy", Money("99.99"), 1))
+    operations[index] = Operation("buy", Money("99.99"), 1)
+    assert history.taxes == calculate_taxes(operations)
+
+    history.delete(index)
+    del operations[index]
+    assert history.taxes == calculate_taxes(operations)
+    assert history.operations == operations
+
+
+def test_replay_stops_when_state_converges() -> None:
+    # a later profit absorbs the loss introduced by the amendment, after that
+    # the state no longer depends on it
+    buy = Operation("buy", Money("10.00"), 100)
+    sell = Operation("sell", Money("12.00"), 100)
+    operations = [buy, sell] * 500
+    history = CheckpointedHistory(operations, interval=8)
+
+    history.edit(101, Operation("sell", Money("5.00"), 100))
+    operations[101] = Operation("sell", Money("5.00"), 100)
+    assert history.taxes == calculate_taxes(operations)
+    assert history.replayed == 16  # from checkpoint 96 to 112
+
+    history.splice(20, 2, [])
+    del operations[20:22]
+    assert history.taxes == calculate_taxes(operations)
+    assert history.replayed == 6
+    assert history.positions == sorted(set(history.positions))
+
+
+def test_splice_rejects_invalid_ranges() -> None:
+    history = CheckpointedHistory(make_operations(10))
+
+    with pytest.raises(IndexError):
+        history.splice(5, 6, [])
+    with pytest.raises(ValueError):
+        CheckpointedHistory(interval=0)
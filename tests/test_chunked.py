@@ -0,0 +1,86 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from capital_gains.__main__ import main
+from capital_gains.chunked import process_file_chunked, process_range, split_ranges
+from capital_gains.cli import process_operations
+from capital_gains.tax import Engine
+
+INPUT_LINES = [
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000}]\n',
+    "\n",  # Linha ignorada
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]\n',
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":50.00, "quantity": 10000}]\n',
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":5.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 3000}]',  # no newline
+]
+
+
+def write_input(tmp_path: Path, repeat: int = 1) -> str:
+    path = tmp_path / "input.jsonl"
+    path.write_text("".join(INPUT_LINES[:-1] * repeat + INPUT_LINES[-1:]))
+    return str(path)
+
+
+def expected_output(repeat: int = 1, engine: Engine = "decimal") -> str:
+    output = io.StringIO()
+    process_operations(INPUT_LINES[:-1] * repeat + INPUT_LINES[-1:], output, engine)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 7, 100])
+def test_ranges_cover_the_file_and_end_at_newlines(tmp_path: Path, parts: int) -> None:
+    path = write_input(tmp_path)
+    data = Path(path).read_bytes()
+
+    ranges = list(split_ranges(path, parts))
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:], strict=False):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
+    assert len(ranges) <= parts
+
+
+def test_empty_file_has_no_ranges(tmp_path: Path) -> None:
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+
+    assert list(split_ranges(str(path), 4)) == []
+
+
+def test_ranges_processed_in_order_match_sequential(tmp_path: Path) -> None:
+    path = write_input(tmp_path)
+
+    output = "".join(process_range(path, r) for r in split_ranges(path, 3))
+
+    assert output == expected_output()
+
+
+@pytest.mark.parametrize("engine", ["decimal", "cents"])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_process_file_chunked_matches_sequential(
+    tmp_path: Path, engine: Engine, jobs: int
+) -> None:
+    path = write_input(tmp_path, repeat=20)
+    writer_stream = io.StringIO()
+
+    process_file_chunked(path, writer_stream, jobs, chunk_bytes=512, engine=engine)
+
+    assert writer_stream.getvalue() == expected_output(20, engine)
+
+
+def test_main_with_input_file(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = write_input(tmp_path, repeat=3)
+
+    main(["--input", path, "--jobs", "2"])
+
+    assert capsys.readouterr().out == expected_output(3)
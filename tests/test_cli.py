@@ -3,6 +3,7 @@ import json
 
 import pytest
 
+from capital_gains.__main__ import main
 from capital_gains.cli import dump_json, parse_json_line, process_operations, readlines
 from capital_gains.money import Money
 from capital_gains.tax import INITIAL_INVESTMENT, Operation, OperationResult
@@ -80,3 +81,38 @@ def test_process_operations_integrates_full_pipeline() -> None:
     output_content = writer_stream.read()
 
     assert output_content == '[{"tax": 0.0}]\n[{"tax": 0.0}]\n'
+
+
+def test_process_operations_cents_engine_output_is_identical() -> None:
+    input_data = (
+        '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+        ' {"operation":"buy", "unit-cost":25.337, "quantity": 3},'
+        ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000},'
+        ' {"operation":"sell", "unit-cost":15.555, "quantity": 3003}]\n'
+        '[{"operation":"buy", "unit-cost":10, "quantity": 1000}]\n'
+    )
+    decimal_stream = io.StringIO()
+    cents_stream = io.StringIO()
+
+    process_operations(io.StringIO(input_data), decimal_stream)
+    process_operations(io.StringIO(input_data), cents_stream, engine="cents")
+
+    assert cents_stream.getvalue() == decimal_stream.getvalue()
+
+
+@pytest.mark.parametrize("argv", [[], ["--jobs", "1", "--engine", "decimal"]])
+def test_main_without_options_is_the_default_run(
+    argv: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    input_data = (
+        '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+        ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000}]\n'
+    )
+    monkeypatch.setattr("sys.argv", ["capital-gains", *argv])
+    monkeypatch.setattr("sys.stdin", io.StringIO(input_data))
+
+    main()
+
+    assert capsys.readouterr().out == '[{"tax": 0.0}, {"tax": 10000.0}]\n'
@@ -0,0 +1,95 @@
+import pytest
+
+from capital_gains.cli import (
+    load_json_line,
+    load_json_line_cents,
+    parse_json_line,
+    parse_json_line_cents,
+)
+from capital_gains.decoder import (
+    decode_operations,
+    decode_operations_cents,
+    normalize_number,
+)
+from capital_gains.money import Money
+from capital_gains.tax import Operation
+
+
+@pytest.mark.parametrize(
+    "unit_cost",
+    [
+        "10.00",
+        "15.5",
+        "10",
+        "-0",
+        "0.125",
+        "0.135",
+        "0.1250000000000001",  # more digits than a float keeps
+        "0.12500000000000001",
+        "123456789012345.675",
+        "1.5e2",
+        "1E-7",
+        "2.675",
+    ],
+)
+def test_decoder_matches_json_path(unit_cost: str) -> None:
+    line = (
+        f'[{{"operation":"buy", "unit-cost":{unit_cost}, "quantity": 100}},'
+        f' {{"quantity": 5, "operation":"sell", "unit-cost":{unit_cost}}}]\n'
+    )
+
+    assert decode_operations(line) == load_json_line(line)
+    assert decode_operations_cents(line) == load_json_line_cents(line)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("10.00", "10.00"),
+        ("0.1250000000000001", str(float("0.1250000000000001"))),
+        ("1.5e2", "150.0"),
+    ],
+)
+def test_normalize_number_only_round_trips_long_literals(
+    text: str, expected: str
+) -> None:
+    assert normalize_number(text) == expected
+
+
+def test_decoder_builds_operations() -> None:
+    line = '[{"operation":"buy", "unit-cost":15.50, "quantity": 100}]'
+
+    assert decode_operations(line) == [
+        Operation(operation="buy", unit_cost=Money("15.50"), quantity=100)
+    ]
+    assert decode_operations_cents(line) == [("buy", 1550, 100, None)]
+
+
+def test_decoder_reads_optional_ticker() -> None:
+    line = '[{"operation":"buy", "unit-cost":15.50, "quantity": 100, "ticker": "ABC"}]'
+
+    assert decode_operations(line) == load_json_line(line)
+    assert decode_operations(line)[0].ticker == "ABC"
+    assert decode_operations_cents(line) == [("buy", 1550, 100, "ABC")]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        '[{"operation":"buy", "unit-cost":"15.50", "quantity": 100}]',
+        '[{"operation":"buy", "unit-cost":15.50, "quantity": 100.0}]',
+        '[{"operation":"buy", "unit-cost":15.50, "quantity": 100, "ticker": 1}]',
+    ],
+)
+def test_decoder_rejects_values_outside_the_schema(line: str) -> None:
+    with pytest.raises(ValueError):
+        decode_operations(line)
+    with pytest.raises(ValueError):
+        decode_operations_cents(line)
+
+
+def test_parse_json_line_falls_back_to_json_path() -> None:
+    line = '[{"operation":"buy", "unit-cost":"15.50", "quantity": 100}]'
+
+    assert parse_json_line(line) == load_json_line(line)
+    assert parse_json_line_cents(line) == [("buy", 1550, 100, None)]
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from capital_gains import engines
+from capital_gains.money import Money
+from capital_gains.tax import InvestmentState, Operation, calculate_taxes
+from tests.differential import find_mismatch, format_operations, fuzz, generate_case
+
+
+def test_registered_engines_agree_with_the_reference() -> None:
+    assert fuzz(cases=500, seed=1, max_operations=20) is None
+
+
+def test_generated_cases_reach_the_edge_cases() -> None:
+    rng = random.Random(5)  # noqa: S311
+    limit_hits = loss_carried = 0
+    for _ in range(300):
+        operations, _ = generate_case(rng, 20)
+        for operation in operations:
+            value = operation.unit_cost * operation.quantity
+            limit_hits += value == Money("20000.00")
+    for _ in range(300):
+        operations, state = generate_case(rng, 20)
+        loss_carried += state.accumulated_loss > Money.zero()
+
+    assert limit_hits > 0
+    assert loss_carried > 0
+
+
+def test_mismatch_is_shrunk_to_a_minimal_reproducer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def inclusive_limit(
+        operations: list[Operation], initial_state: InvestmentState
+    ) -> list[Money]:
+        # broken engine: taxes sells worth exactly the exemption limit
+        taxes = calculate_taxes(operations, initial_state)
+        return [
+            Money("0.01")
+            if operation.operation == "sell"
+            and operation.unit_cost * operation.quantity == Money("20000.00")
+            else tax
+            for operation, tax in zip(operations, taxes, strict=True)
+        ]
+
+    monkeypatch.setitem(engines.ENGINES, "inclusive-limit", inclusive_limit)
+
+    mismatch = fuzz(cases=2000, seed=2, max_operations=20)
+
+    assert mismatch is not None
+    assert mismatch.engine == "inclusive-limit"
+    assert len(mismatch.operations) <= 2
+    assert find_mismatch(mismatch.operations, mismatch.initial_state) is not None
+    assert format_operations(mismatch.operations).startswith('[{"operation"')
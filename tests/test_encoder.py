@@ -0,0 +1,54 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.encoder import (
+    encode_results,
+    encode_taxes,
+    encode_taxes_cents,
+)
+from capital_gains.money import Money
+from capital_gains.tax import INITIAL_INVESTMENT, OperationResult
+
+AMOUNTS = [
+    "0.00",
+    "0.01",
+    "123.46",
+    "10000.00",
+    "3700.10",
+    "99999999999999999.99",
+    "12345678901234567890.12",
+]
+
+
+def expected_json(amounts: list[str]) -> str:
+    return json.dumps([{"tax": float(Decimal(amount))} for amount in amounts])
+
+
+@pytest.mark.parametrize("amount", AMOUNTS)
+def test_encode_taxes_matches_json_dumps(amount: str) -> None:
+    taxes = [Money.zero(), Money(amount), Money(amount)]
+
+    assert encode_taxes(taxes) == expected_json(["0.00", amount, amount])
+
+
+@pytest.mark.parametrize("amount", AMOUNTS)
+def test_encode_taxes_cents_matches_json_dumps(amount: str) -> None:
+    cents = int(Decimal(amount).scaleb(2))
+
+    assert encode_taxes_cents([0, cents]) == expected_json(["0.00", amount])
+
+
+def test_encode_results_uses_the_tax_of_each_result() -> None:
+    results = [
+        OperationResult(INITIAL_INVESTMENT, tax=Money(123.456)),
+        OperationResult(INITIAL_INVESTMENT, tax=Money(0)),
+    ]
+
+    assert encode_results(results) == '[{"tax": 123.46}, {"tax": 0.0}]'
+
+
+def test_encode_empty_lists() -> None:
+    assert encode_taxes([]) == json.dumps([])
+    assert encode_taxes_cents([]) == json.dumps([])
@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Cold start of the CLI, measured with -X importtime on a fresh interpreter.
+# Only modules imported after interpreter startup (which ends with site) count.
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORT_BUDGET_US = 40_000  # cumulative import time of capital_gains.__main__
+ATTEMPTS = 3  # best of, timings on shared machines are noisy
+# argparse only for options, json and the decoder only once a line is read,
+# the cents engine only with --engine cents
+DEFERRED_MODULES = [
+    "argparse",
+    "capital_gains.cents",
+    "capital_gains.decoder",
+    "dataclasses",
+    "inspect",
+    "json",
+    "re",
+    "typing",
+]
+# the thin client must start faster than the CLI it stands in for
+CLIENT_DEFERRED_MODULES = ["asyncio", "decimal", "json", "capital_gains.tax"]
+
+
+def import_times(module: str) -> dict[str, int]:
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # "import time: self [us] | cumulative | imported package", children first
+    cumulative: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        _, total, name = line.split("|")
+        if name.strip() == "site":
+            cumulative.clear()  # everything so far was interpreter startup
+        elif total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def test_cli_imports_fit_the_budget() -> None:
+    best = min(
+        import_times("capital_gains.__main__")["capital_gains.__main__"]
+        for _ in range(ATTEMPTS)
+    )
+    assert best <= IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_cli_does_not_import_at_startup(module: str) -> None:
+    assert module not in import_times("capital_gains.__main__")
+
+
+@pytest.mark.parametrize("module", CLIENT_DEFERRED_MODULES)
+def test_client_does_not_import_the_calculation(module: str) -> None:
+    assert module not in import_times("capital_gains.client")
+
+
+def test_decimal_run_does_not_import_the_cents_engine() -> None:
+    line = '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]'
+    completed = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            "import sys; from capital_gains.cli import process_line;"
+            f" process_line({line!r});"
+            " print('capital_gains.cents' in sys.modules)",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stdout == "False\n"
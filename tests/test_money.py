@@ -1,3 +1,5 @@
+import pickle
+from dataclasses import FrozenInstanceError
 from decimal import Decimal
 
 import pytest
@@ -127,3 +129,21 @@ class TestMoney:
         # assert
         assert zero_usd.amount == Decimal("0.00")
         assert zero_usd.currency == custom_currency
+
+    def test_should_be_immutable(self) -> None:
+        money = Money(Decimal("10.00"))
+        with pytest.raises(FrozenInstanceError):
+            money.amount = Decimal("20.00")  # type: ignore
+
+    def test_should_not_carry_instance_dict(self) -> None:
+        assert not hasattr(Money(Decimal("10.00")), "__dict__")
+
+    def test_should_survive_pickling(self) -> None:
+        money = Money(Decimal("10.00"), "USD")
+        assert pickle.loads(pickle.dumps(money)) == money  # noqa: S301
+
+    def test_arithmetic_results_keep_two_decimal_places(self) -> None:
+        money = Money(Decimal("10.10")) + Money(Decimal("0.90"))
+        assert str(money.amount) == "11.00"
+        assert str((money * 3).amount) == "33.00"
+        assert str((money - money).amount) == "0.00"
@@ -0,0 +1,116 @@
+import io
+import threading
+import time
+
+import pytest
+
+from capital_gains.__main__ import main
+from capital_gains.output import FLUSH_POLICIES, BufferedLineWriter, FlushPolicy
+from capital_gains.streaming import process_operations_streaming
+
+
+class RecordingWriter(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[str] = []
+
+    def write(self, text: str) -> int:
+        self.writes.append(text)
+        return super().write(text)
+
+
+LINES = [f'[{{"tax": {index}.0}}]\n' for index in range(10)]
+
+
+@pytest.mark.parametrize(
+    "policy, expected_writes",
+    [
+        (FlushPolicy(max_lines=4), 3),  # 4 + 4 + the 2 left at exit
+        (FlushPolicy(max_chars=len(LINES[0]) * 5), 2),
+        (FlushPolicy(max_lines=1), 10),
+        (FlushPolicy(max_seconds=3600), 1),
+        (FlushPolicy(max_seconds=0), 10),
+    ],
+)
+def test_flush_policies_group_lines(policy: FlushPolicy, expected_writes: int) -> None:
+    writer_stream = RecordingWriter()
+
+    with BufferedLineWriter(writer_stream, policy) as output:
+        for line in LINES:
+            output.write(line)
+
+    assert writer_stream.getvalue() == "".join(LINES)
+    assert len(writer_stream.writes) == expected_writes
+
+
+def test_lines_are_counted_inside_multi_line_writes() -> None:
+    writer_stream = RecordingWriter()
+    output = BufferedLineWriter(writer_stream, FlushPolicy(max_lines=5))
+
+    output.write("".join(LINES[:6]))
+
+    assert writer_stream.writes == ["".join(LINES[:6])]
+
+
+def test_time_policy_flushes_while_the_input_is_quiet() -> None:
+    writer_stream = RecordingWriter()
+    output = BufferedLineWriter(writer_stream, FlushPolicy(max_seconds=0.01))
+
+    output.write(LINES[0])  # and nothing after it, as with tail -f
+    deadline = time.monotonic() + 5
+    while not writer_stream.writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert writer_stream.writes == [LINES[0]]
+
+
+def test_time_policy_stops_its_timer_on_exit() -> None:
+    writer_stream = RecordingWriter()
+
+    with BufferedLineWriter(writer_stream, FlushPolicy(max_seconds=3600)) as output:
+        output.write(LINES[0])
+        timers = [
+            thread
+            for thread in threading.enumerate()
+            if isinstance(thread, threading.Timer)
+        ]
+        assert timers
+
+    assert writer_stream.writes == [LINES[0]]
+    for timer in timers:
+        timer.join(timeout=5)
+        assert not timer.is_alive()
+
+
+@pytest.mark.parametrize("policy", list(FLUSH_POLICIES))
+def test_main_output_is_the_same_for_every_policy(
+    policy: str,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    line = '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]\n'
+    monkeypatch.setattr("sys.stdin", io.StringIO(line * 3))
+
+    main(["--flush", policy])
+
+    assert capsys.readouterr().out == '[{"tax": 0.0}]\n' * 3
+
+
+@pytest.mark.parametrize("policy_name", sorted(FLUSH_POLICIES))
+def test_streamed_line_keeps_the_buffer_bounded(policy_name: str) -> None:
+    operations = ", ".join(
+        '{"operation": "buy", "unit-cost": 10.00, "quantity": 1}' for _ in range(5_000)
+    )
+    writer_stream = RecordingWriter()
+    max_buffered_chars = 4096
+
+    with BufferedLineWriter(
+        writer_stream, FLUSH_POLICIES[policy_name], max_buffered_chars
+    ) as output:
+        process_operations_streaming(io.StringIO(f"[{operations}]\n"), output)
+
+    # every piece written by the streaming mode is much shorter than 64 chars
+    assert max(map(len, writer_stream.writes)) < max_buffered_chars + 64
+    assert len(writer_stream.writes) >= len(writer_stream.getvalue()) // (
+        max_buffered_chars + 64
+    )
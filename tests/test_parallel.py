@@ -0,0 +1,117 @@
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from capital_gains.__main__ import parse_args
+from capital_gains.cli import process_line, process_operations
+from capital_gains.parallel import (
+    Backend,
+    process_chunk,
+    process_operations_parallel,
+    resolve_jobs,
+)
+from capital_gains.tax import Engine
+
+ENGINES: list[Engine] = ["decimal", "cents"]
+
+INPUT_LINES = [
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000}]\n',
+    "\n",  # Linha ignorada
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]\n',
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":50.00, "quantity": 10000}]\n',
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":5.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 3000}]\n',
+]
+
+
+def test_process_chunk_serializes_one_line_per_input() -> None:
+    output = process_chunk(
+        ('[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]\n',) * 2
+    )
+
+    assert output == '[{"tax": 0.0}]\n[{"tax": 0.0}]\n'
+
+
+def test_resolve_jobs_uses_every_core_for_zero() -> None:
+    assert resolve_jobs(0) >= 1
+    assert resolve_jobs(3) == 3
+
+
+def test_resolve_jobs_rejects_negative_values() -> None:
+    with pytest.raises(ValueError):
+        resolve_jobs(-1)
+
+
+@pytest.mark.parametrize("chunk_size, max_pending", [(1, 1), (2, None), (100, 4)])
+def test_parallel_output_matches_sequential_order(
+    chunk_size: int, max_pending: int | None
+) -> None:
+    expected_stream = io.StringIO()
+    process_operations(io.StringIO("".join(INPUT_LINES)), expected_stream)
+
+    writer_stream = io.StringIO()
+    process_operations_parallel(
+        io.StringIO("".join(INPUT_LINES)),
+        writer_stream,
+        jobs=2,
+        chunk_size=chunk_size,
+        max_pending=max_pending,
+    )
+
+    assert writer_stream.getvalue() == expected_stream.getvalue()
+    assert writer_stream.getvalue() == (
+        '[{"tax": 0.0}, {"tax": 10000.0}]\n'
+        '[{"tax": 0.0}]\n'
+        '[{"tax": 0.0}, {"tax": 80000.0}]\n'
+        '[{"tax": 0.0}, {"tax": 0.0}, {"tax": 1000.0}]\n'
+    )
+
+
+@pytest.mark.parametrize("backend", ["process", "thread", "interpreter"])
+def test_backends_match_sequential_order(backend: Backend) -> None:
+    if backend == "interpreter" and sys.version_info < (3, 14):
+        pytest.skip("interpreter pools need Python 3.14")
+    expected_stream = io.StringIO()
+    process_operations(io.StringIO("".join(INPUT_LINES * 20)), expected_stream)
+
+    writer_stream = io.StringIO()
+    process_operations_parallel(
+        io.StringIO("".join(INPUT_LINES * 20)),
+        writer_stream,
+        jobs=3,
+        chunk_size=4,
+        backend=backend,
+    )
+
+    assert writer_stream.getvalue() == expected_stream.getvalue()
+
+
+def test_process_line_is_safe_from_many_threads() -> None:
+    # shared caches (Money.zero, unit cost parsing, json decoders) under load
+    lines = [line for line in INPUT_LINES * 200 if line.strip()]
+    expected = [process_line(line, engine) for line in lines for engine in ENGINES]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                process_line,
+                [line for line in lines for _ in ENGINES],
+                [engine for _ in lines for engine in ENGINES],
+            )
+        )
+
+    assert results == expected
+
+
+@pytest.mark.parametrize("mode", [["--input", "entrada.jsonl"], ["--shards", "2"]])
+@pytest.mark.parametrize("backend", ["thread", "interpreter"])
+def test_backend_is_rejected_where_it_does_not_apply(
+    mode: list[str], backend: str
+) -> None:
+    with pytest.raises(SystemExit):
+        parse_args([*mode, "--backend", backend])
@@ -0,0 +1,74 @@
+from itertools import product
+
+import pytest
+
+from capital_gains.money import Money
+from capital_gains.quote import (
+    quote_sell,
+    quote_sells,
+    quote_sells_cents,
+    quote_sells_python,
+)
+from capital_gains.tax import InvestmentState
+
+STATE = InvestmentState(
+    quantity=10000,
+    weighted_average_price=Money("16.67"),
+    accumulated_loss=Money("1234.57"),
+)
+# around the average price, the exemption limit and half-cent taxes
+PRICES = ["0.01", "10.00", "16.66", "16.67", "16.68", "20.00", "20.01", "33.33"]
+QUANTITIES = [1, 3, 999, 1000, 1001, 1200, 10000]
+
+
+def test_quote_sell_is_a_hypothetical_sell() -> None:
+    result = quote_sell(STATE, Money("20.00"), 5000)
+
+    assert result.new_state.quantity == 5000
+    assert result.tax == Money("3083.09")
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_batched_quotes_match_scalar_quotes(vectorized: bool) -> None:
+    if vectorized:
+        pytest.importorskip("numpy")
+    pairs = list(product(PRICES, QUANTITIES))
+    unit_costs = [int(Money(price).amount * 100) for price, _ in pairs]
+    quantities = [quantity for _, quantity in pairs]
+    quote = quote_sells_cents if vectorized else quote_sells_python
+
+    quotes = quote(STATE, unit_costs, quantities)
+
+    for index, (price, quantity) in enumerate(pairs):
+        expected = quote_sell(STATE, Money(price), quantity)
+        assert quotes.taxes[index] == int(expected.tax.amount * 100)
+        assert quotes.accumulated_losses[index] == int(
+            expected.new_state.accumulated_loss.amount * 100
+        )
+        assert quotes.quantities[index] == expected.new_state.quantity
+
+
+def test_batched_quotes_beyond_int64_match_scalar_quotes() -> None:
+    pytest.importorskip("numpy")
+    unit_costs = [10**12, 10**7]
+    quantities = [10**8, 10**12]
+
+    quotes = quote_sells_cents(STATE, unit_costs, quantities)
+
+    assert list(quotes.taxes) == quote_sells_python(STATE, unit_costs, quantities).taxes
+    assert quotes.taxes[0] == int(
+        quote_sell(STATE, Money(10**10), 10**8).tax.amount * 100
+    )
+
+
+def test_quote_sells_returns_operation_results() -> None:
+    pairs = [(Money(price), 1000) for price in PRICES]
+
+    results = quote_sells(STATE, pairs)
+
+    assert results == [quote_sell(STATE, price, quantity) for price, quantity in pairs]
+
+
+def test_quote_sells_rejects_other_currencies() -> None:
+    with pytest.raises(ValueError):
+        quote_sells(STATE, [(Money("1.00", "USD"), 1)])
@@ -0,0 +1,94 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.cents import calculate_taxes_cents, money_to_cents
+from capital_gains.money import Money
+from capital_gains.tax import InvestmentState, Operation, calculate_taxes
+
+np = pytest.importorskip("numpy")
+
+from capital_gains.scenarios import run_scenarios  # noqa: E402
+
+OPERATIONS = [
+    Operation("buy", Money("10.00"), 10000, "A"),
+    Operation("buy", Money("25.00"), 3000, "B"),
+    Operation("sell", Money("12.00"), 2500, "A"),
+    Operation("buy", Money("9.99"), 333, "A"),
+    Operation("sell", Money("20.00"), 3000, "B"),
+    Operation("sell", Money("15.01"), 7833, "A"),
+]
+
+
+def make_shocks(scenarios: int, seed: int = 3) -> list[list[int]]:
+    rng = random.Random(seed)  # noqa: S311
+    return [[rng.randint(-900, 900) for _ in OPERATIONS] for _ in range(scenarios)]
+
+
+def shocked(operations: list[Operation], row: list[int]) -> list[Operation]:
+    return [
+        Operation(
+            operation.operation,
+            Money(operation.unit_cost.amount + Decimal(shock).scaleb(-2)),
+            operation.quantity,
+            operation.ticker,
+        )
+        for operation, shock in zip(operations, row, strict=True)
+    ]
+
+
+def test_every_lane_matches_the_scalar_engines() -> None:
+    initial_state = InvestmentState(
+        quantity=0, weighted_average_price=Money.zero(), accumulated_loss=Money("5.55")
+    )
+    shocks = make_shocks(200)
+
+    taxes = run_scenarios(OPERATIONS, shocks, initial_state)
+
+    assert taxes.shape == (200, len(OPERATIONS))
+    for lane, row in zip(taxes, shocks, strict=True):
+        operations = shocked(OPERATIONS, row)
+        expected = [
+            money_to_cents(tax) for tax in calculate_taxes(operations, initial_state)
+        ]
+        assert lane.tolist() == expected
+    assert taxes.any()
+
+
+def test_lanes_near_int64_overflow_match_the_scalar_engine() -> None:
+    operations = [
+        Operation("buy", Money("900000000.00"), 10_000_000),
+        Operation("buy", Money("900000000.00"), 10_000_000),
+        Operation("sell", Money("950000000.00"), 15_000_000),
+    ]
+    # the last lane pushes unit cost * quantity past 9.2e18 cents
+    shocks = [[0, 0, 0], [0, 0, -123_456], [0, 0, 600_000_000_000]]
+
+    taxes = run_scenarios(operations, shocks)
+
+    for lane, row in zip(taxes, shocks, strict=True):
+        expected = [
+            money_to_cents(tax) for tax in calculate_taxes(shocked(operations, row))
+        ]
+        assert [int(tax) for tax in lane] == expected
+    assert taxes.dtype == object  # the overflowing lane ran on Python integers
+
+
+def test_lanes_split_across_processes_match_in_order() -> None:
+    shocks = make_shocks(100)
+
+    taxes = run_scenarios(OPERATIONS, shocks, jobs=2, lanes_per_task=16)
+
+    assert taxes.tolist() == run_scenarios(OPERATIONS, shocks).tolist()
+    first = shocked(OPERATIONS, shocks[0])
+    cents_operations = [
+        (op.operation, money_to_cents(op.unit_cost), op.quantity, op.ticker)
+        for op in first
+    ]
+    assert taxes[0].tolist() == calculate_taxes_cents(cents_operations)
+
+
+def test_shocks_must_match_the_operations() -> None:
+    with pytest.raises(ValueError):
+        run_scenarios(OPERATIONS, np.zeros((3, 2)))
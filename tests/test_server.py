@@ -0,0 +1,139 @@
+import asyncio
+import io
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from capital_gains.cli import process_line, process_operations
+from capital_gains.client import request
+from capital_gains.server import TaxServer
+from capital_gains.tax import Engine
+
+INPUT_LINES = [
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000}]\n',
+    "\n",  # Linha ignorada
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]\n',
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":50.00, "quantity": 10000}]\n',
+]
+
+
+def expected_output(lines: list[str]) -> str:
+    output = io.StringIO()
+    process_operations(lines, output)
+    return output.getvalue()
+
+
+async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> str:
+    writer.write("".join(INPUT_LINES).encode())
+    await writer.drain()
+    writer.write_eof()
+    output = (await reader.read()).decode()
+    writer.close()
+    await writer.wait_closed()
+    return output
+
+
+def test_tcp_clients_receive_replies_in_order() -> None:
+    async def scenario() -> list[str]:
+        server = TaxServer()
+        async with await server.serve(port=0) as listener:
+            port = listener.sockets[0].getsockname()[1]
+            connections = [
+                await asyncio.open_connection("127.0.0.1", port) for _ in range(5)
+            ]
+            outputs = await asyncio.gather(*(send(*conn) for conn in connections))
+        await server.close()
+        return outputs
+
+    outputs = asyncio.run(scenario())
+
+    assert outputs == [expected_output(INPUT_LINES)] * 5
+
+
+def test_unix_socket_with_cents_engine(tmp_path: Path) -> None:
+    socket_path = str(tmp_path / "capital-gains.sock")
+
+    async def scenario() -> str:
+        server = TaxServer(engine="cents")
+        async with await server.serve(socket_path):
+            output = await send(*await asyncio.open_unix_connection(socket_path))
+        await server.close()
+        return output
+
+    assert asyncio.run(scenario()) == expected_output(INPUT_LINES)
+
+
+def test_invalid_line_gets_an_error_reply() -> None:
+    async def scenario() -> str:
+        server = TaxServer()
+        async with await server.serve(port=0) as listener:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"not json\n" + INPUT_LINES[2].encode())
+            writer.write_eof()
+            output = (await reader.read()).decode()
+            writer.close()
+            await writer.wait_closed()
+        await server.close()
+        return output
+
+    error, reply = asyncio.run(scenario()).splitlines()
+
+    assert error.startswith('{"error": "JSONDecodeError')
+    assert reply == '[{"tax": 0.0}]'
+
+
+def test_client_request_streams_lines_to_the_server() -> None:
+    server = TaxServer()
+    loop = asyncio.new_event_loop()
+    listener = loop.run_until_complete(server.serve(port=0))
+    port = listener.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        output = io.StringIO()
+        with socket.create_connection(("127.0.0.1", port)) as connection:
+            request(connection, INPUT_LINES, output)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
+        loop.run_until_complete(server.close())
+        loop.close()
+
+    assert output.getvalue() == expected_output(INPUT_LINES)
+
+
+def test_batches_are_processed_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    released = threading.Event()
+
+    def process_line_when_released(line: str, engine: Engine) -> str:
+        # only set from the event loop, which would be stuck if it ran this
+        assert released.wait(timeout=5)
+        return process_line(line, engine)
+
+    monkeypatch.setattr("capital_gains.server.process_line", process_line_when_released)
+
+    async def scenario() -> str:
+        server = TaxServer()
+        async with await server.serve(port=0) as listener:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(INPUT_LINES[2].encode())
+            writer.write_eof()
+            await asyncio.sleep(0.05)
+            released.set()
+            output = (await reader.read()).decode()
+            writer.close()
+            await writer.wait_closed()
+        await server.close()
+        return output
+
+    assert asyncio.run(scenario()) == expected_output(INPUT_LINES[2:3])
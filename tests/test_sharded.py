@@ -0,0 +1,82 @@
+import io
+import json
+
+import pytest
+
+from capital_gains.cli import process_operations
+from capital_gains.sharded import (
+    calculate_shard,
+    process_operations_sharded,
+    shard_of,
+    split_line,
+)
+from capital_gains.tax import Engine
+
+# the same trades as one ticker each, interleaved in a single line
+ABC = [
+    {"operation": "buy", "unit-cost": 10.00, "quantity": 10000, "ticker": "ABC"},
+    {"operation": "sell", "unit-cost": 20.00, "quantity": 5000, "ticker": "ABC"},
+]
+XYZ = [
+    {"operation": "buy", "unit-cost": 10.00, "quantity": 10000, "ticker": "XYZ"},
+    {"operation": "sell", "unit-cost": 5.00, "quantity": 5000, "ticker": "XYZ"},
+    {"operation": "sell", "unit-cost": 20.00, "quantity": 3000, "ticker": "XYZ"},
+]
+INTERLEAVED = [XYZ[0], ABC[0], XYZ[1], ABC[1], XYZ[2]]
+INPUT_LINES = [
+    json.dumps(INTERLEAVED) + "\n",
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]\n',
+    json.dumps(ABC) + "\n",
+]
+
+
+def run(lines: list[str], engine: Engine = "decimal") -> list[object]:
+    output = io.StringIO()
+    process_operations(lines, output, engine)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("engine", ["decimal", "cents"])
+def test_each_ticker_keeps_its_own_state(engine: Engine) -> None:
+    [interleaved] = run([INPUT_LINES[0]], engine)
+    [abc, xyz] = run([json.dumps(ABC), json.dumps(XYZ)], engine)
+
+    assert interleaved == [xyz[0], abc[0], xyz[1], abc[1], xyz[2]]
+    assert interleaved == [
+        {"tax": 0.0},
+        {"tax": 0.0},
+        {"tax": 0.0},
+        {"tax": 10000.0},
+        {"tax": 1000.0},
+    ]
+
+
+def test_split_line_groups_operations_by_ticker_hash() -> None:
+    layout, operations = split_line(INPUT_LINES[0], 2)
+
+    assert sorted(sum(layout, [])) == list(range(len(INTERLEAVED)))
+    for shard, positions in enumerate(layout):
+        for position in positions:
+            assert shard_of(INTERLEAVED[position]["ticker"], 2) == shard
+    assert [len(shard) for shard in operations] == [len(shard) for shard in layout]
+    assert shard_of(None, 4) == 0
+
+
+def test_calculate_shard_encodes_taxes_per_line() -> None:
+    lines = [[("buy", "10.0", 100, "A"), ("sell", "300.0", 100, "A")]]
+
+    assert calculate_shard(lines) == [['{"tax": 0.0}', '{"tax": 5800.0}']]
+    assert calculate_shard(lines, "cents") == calculate_shard(lines)
+
+
+@pytest.mark.parametrize("engine", ["decimal", "cents"])
+def test_sharded_output_matches_sequential_in_input_order(engine: Engine) -> None:
+    expected = io.StringIO()
+    process_operations(INPUT_LINES * 5, expected, engine)
+    writer_stream = io.StringIO()
+
+    process_operations_sharded(
+        INPUT_LINES * 5, writer_stream, shards=2, chunk_size=2, engine=engine
+    )
+
+    assert writer_stream.getvalue() == expected.getvalue()
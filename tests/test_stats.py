@@ -0,0 +1,57 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from capital_gains.__main__ import main
+from capital_gains.cli import process_operations
+from capital_gains.stats import STAGES, PipelineStats, process_operations_with_stats
+from capital_gains.tax import Engine
+
+INPUT_DATA = (
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":5.00, "quantity": 5000}]\n'
+    "\n"
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":50.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":50.00, "quantity": 10},'
+    ' {"operation":"sell", "unit-cost":50.00, "quantity": 4990}]\n'
+)
+
+
+@pytest.mark.parametrize("engine", ["decimal", "cents"])
+def test_stats_count_lines_operations_and_taxable_sells(engine: Engine) -> None:
+    expected_stream = io.StringIO()
+    process_operations(io.StringIO(INPUT_DATA), expected_stream, engine)
+    writer_stream = io.StringIO()
+    stats = PipelineStats()
+
+    process_operations_with_stats(io.StringIO(INPUT_DATA), writer_stream, stats, engine)
+
+    assert writer_stream.getvalue() == expected_stream.getvalue()
+    assert stats.lines == 2
+    assert stats.operations == 7
+    assert stats.buys == 2
+    assert stats.sells == 5
+    assert stats.taxable_sells == 3
+    assert stats.slowest_line in (1, 2)
+    assert set(stats.stage_seconds) == set(STAGES)
+    assert sum(stats.stage_seconds.values()) <= stats.wall_seconds
+
+
+def test_main_writes_stats_report_to_file(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    report_path = tmp_path / "stats.json"
+    monkeypatch.setattr("sys.stdin", io.StringIO(INPUT_DATA))
+
+    main(["--stats-file", str(report_path)])
+
+    assert capsys.readouterr().out.count("\n") == 2
+    report = json.loads(report_path.read_text())
+    assert report["lines"] == 2
+    assert report["taxable_sells"] == 3
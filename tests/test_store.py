@@ -0,0 +1,77 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from capital_gains.__main__ import main
+from capital_gains.cli import process_operations
+from capital_gains.money import Money
+from capital_gains.store import StateStore, process_account_operations
+from capital_gains.tax import INITIAL_INVESTMENT, Engine, InvestmentState
+
+HISTORY = (
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":5.00, "quantity": 5000}]\n'
+)
+NEW_OPERATIONS = (
+    '[{"operation":"buy", "unit-cost":20.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":30.00, "quantity": 5000}]\n'
+)
+
+
+def test_unknown_account_starts_from_initial_state(tmp_path: Path) -> None:
+    with StateStore(str(tmp_path / "state.db")) as store:
+        assert store.load("missing") == INITIAL_INVESTMENT
+
+
+def test_saved_state_survives_reopening(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.db")
+    state = InvestmentState(
+        quantity=7,
+        weighted_average_price=Money("16.67"),
+        accumulated_loss=Money("25000.00"),
+    )
+    with StateStore(path) as store:
+        store.save("account", state)
+
+    with StateStore(path) as store:
+        assert store.load("account") == state
+        assert store.load("other") == INITIAL_INVESTMENT
+
+
+@pytest.mark.parametrize("engine", ["decimal", "cents"])
+def test_appended_operations_match_full_history(tmp_path: Path, engine: Engine) -> None:
+    full_history = io.StringIO()
+    process_operations(
+        io.StringIO(json.dumps(json.loads(HISTORY) + json.loads(NEW_OPERATIONS))),
+        full_history,
+    )
+
+    with StateStore(str(tmp_path / "state.db")) as store:
+        process_account_operations(io.StringIO(HISTORY), io.StringIO(), store, "a")
+        writer_stream = io.StringIO()
+        process_account_operations(
+            io.StringIO(NEW_OPERATIONS), writer_stream, store, "a", engine
+        )
+
+    taxes = json.loads(writer_stream.getvalue())
+    assert taxes == json.loads(full_history.getvalue())[2:]
+
+
+def test_main_with_state_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = str(tmp_path / "state.db")
+    for line in (HISTORY, NEW_OPERATIONS):
+        monkeypatch.setattr("sys.stdin", io.StringIO(line))
+        main(["--state-store", path, "--account", "a"])
+
+    assert capsys.readouterr().out == (
+        '[{"tax": 0.0}, {"tax": 0.0}]\n[{"tax": 0.0}, {"tax": 10000.0}]\n'
+    )
+
+
+def test_account_requires_state_store() -> None:
+    with pytest.raises(SystemExit):
+        main(["--account", "a"])
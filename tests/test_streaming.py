@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+from capital_gains.cli import process_operations
+from capital_gains.money import Money
+from capital_gains.streaming import OperationArrayReader, process_operations_streaming
+from capital_gains.tax import Operation
+
+INPUT_DATA = (
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":20.00, "quantity": 5000},'
+    ' {"operation":"sell", "unit-cost":5.00, "quantity": 5000}]\n'
+    "\n"
+    '[{"operation":"buy", "unit-cost":10.00, "quantity": 10000},'
+    ' {"operation":"sell", "unit-cost":50.00, "quantity": 10000}]\n'
+)
+
+
+def test_reader_yields_operations_one_array_at_a_time() -> None:
+    arrays = OperationArrayReader(
+        io.StringIO('[{"operation":"buy", "unit-cost":15.50, "quantity": 100}]\n[]'),
+        read_size=4,
+    )
+
+    first = arrays.next_array()
+    assert first is not None
+    assert list(first) == [
+        Operation(operation="buy", unit_cost=Money("15.50"), quantity=100)
+    ]
+
+    second = arrays.next_array()
+    assert second is not None
+    assert list(second) == []
+
+    assert arrays.next_array() is None
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 64 * 1024])
+def test_streaming_output_matches_line_processing(read_size: int) -> None:
+    expected_stream = io.StringIO()
+    process_operations(io.StringIO(INPUT_DATA), expected_stream)
+
+    writer_stream = io.StringIO()
+    process_operations_streaming(io.StringIO(INPUT_DATA), writer_stream, read_size)
+
+    assert writer_stream.getvalue() == expected_stream.getvalue()
+    assert writer_stream.getvalue() == (
+        '[{"tax": 0.0}, {"tax": 10000.0}, {"tax": 0.0}]\n'
+        '[{"tax": 0.0}, {"tax": 80000.0}]\n'
+    )
+
+
+@pytest.mark.parametrize(
+    "input_data",
+    [
+        '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}',
+        '{"operation":"buy", "unit-cost":10.00, "quantity": 100}',
+        '[{"operation":"buy", "unit-cost":10.00, "quantity": 100};]',
+    ],
+)
+def test_streaming_rejects_malformed_input(input_data: str) -> None:
+    with pytest.raises(ValueError):
+        process_operations_streaming(io.StringIO(input_data), io.StringIO())
@@ -1,10 +1,17 @@
+from collections.abc import Iterator
 from decimal import Decimal
 
+import pytest
+
 from capital_gains.money import Money
 from capital_gains.tax import (
     TAX_RATE,
     InvestmentState,
     Operation,
+    OperationResult,
+    calculate_final_states,
+    calculate_taxes,
+    iter_taxes,
     process_operation,
     process_operations_batch,
 )
@@ -488,3 +495,72 @@ def test_full_sequence_of_operations_with_final_taxable_sale() -> None:
     assert result6.tax == expected_tax, "Final sale must be taxed due to volume > 20k."
     assert result6.new_state.quantity == 0
     assert result6.new_state.accumulated_loss == Money.zero()
+
+
+def test_calculate_taxes_matches_batch_from_initial_state() -> None:
+    # arrange
+    initial_state = InvestmentState(
+        quantity=3,
+        weighted_average_price=Money("10.01"),
+        accumulated_loss=Money("7.50"),
+    )
+    operations_batch = [
+        Operation(operation="buy", unit_cost=Money("20.33"), quantity=7),
+        Operation(operation="sell", unit_cost=Money("5.00"), quantity=4),
+        Operation(operation="buy", unit_cost=Money("99.99"), quantity=1000),
+        Operation(operation="sell", unit_cost=Money("150.00"), quantity=1006),
+    ]
+    expected_taxes = [
+        result.tax
+        for result in process_operations_batch(operations_batch, initial_state)
+    ]
+
+    # act
+    actual_taxes = calculate_taxes(operations_batch, initial_state)
+
+    # assert
+    assert actual_taxes == expected_taxes
+    assert actual_taxes[-1] == Money("10149.32")
+
+
+def test_calculate_taxes_rejects_other_currencies() -> None:
+    operations_batch = [
+        Operation(operation="buy", unit_cost=Money("1.00", "USD"), quantity=1)
+    ]
+
+    with pytest.raises(ValueError):
+        calculate_taxes(operations_batch)
+
+
+def test_domain_objects_are_slotted() -> None:
+    state = InvestmentState()
+    operation = Operation(operation="buy", unit_cost=Money("1.00"), quantity=1)
+    result = OperationResult(new_state=state, tax=Money.zero())
+
+    for instance in (state, operation, result):
+        assert not hasattr(instance, "__dict__")
+
+
+def test_iter_taxes_is_lazy() -> None:
+    def endless_buys() -> Iterator[Operation]:
+        while True:
+            yield Operation(operation="buy", unit_cost=Money("10.00"), quantity=1)
+
+    taxes = iter_taxes(endless_buys())
+
+    assert [next(taxes) for _ in range(3)] == [Money.zero()] * 3
+
+
+def test_calculate_final_states_matches_last_result_of_each_ticker() -> None:
+    operations_batch = [
+        Operation("buy", Money("10.00"), 100, "A"),
+        Operation("buy", Money("20.00"), 50, "B"),
+        Operation("sell", Money("5.00"), 40, "A"),
+        Operation("buy", Money("30.00"), 50, "B"),
+    ]
+    results = process_operations_batch(operations_batch)
+
+    final_states = calculate_final_states(operations_batch)
+
+    assert final_states == {"A": results[2].new_state, "B": results[3].new_state}
+    assert calculate_final_states([]) == {}
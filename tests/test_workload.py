@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.workload import WorkloadSpec, generate_lines
+from capital_gains.tax import EXEMPTION_LIMIT
+
+SPEC = WorkloadSpec(lines=50, operations_per_line=40, exemption_crossing_rate=0.5)
+
+
+def test_workload_is_deterministic() -> None:
+    assert list(generate_lines(SPEC)) == list(generate_lines(SPEC))
+    assert list(generate_lines(SPEC)) != list(
+        generate_lines(WorkloadSpec(lines=50, operations_per_line=40, seed=7))
+    )
+
+
+def test_workload_never_sells_more_than_held() -> None:
+    for line in generate_lines(SPEC):
+        operations = json.loads(line)
+        assert len(operations) == SPEC.operations_per_line
+        held = 0
+        for operation in operations:
+            if operation["operation"] == "buy":
+                held += operation["quantity"]
+            else:
+                assert 0 < operation["quantity"] <= held
+                held -= operation["quantity"]
+
+
+def test_workload_crosses_the_exemption_limit() -> None:
+    sell_values = [
+        operation["unit-cost"] * operation["quantity"]
+        for line in generate_lines(SPEC)
+        for operation in json.loads(line)
+        if operation["operation"] == "sell"
+    ]
+    crossing = [value > EXEMPTION_LIMIT.amount for value in sell_values]
+
+    assert sell_values
+    assert 0 < sum(crossing) < len(crossing)